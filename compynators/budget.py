@@ -0,0 +1,126 @@
+import typing as t
+import contextlib
+import contextvars
+import time
+from dataclasses import dataclass
+from enum import Enum
+
+# Parse budgets.
+#
+# A budget is enforced by a `Meter` installed for the duration of a parse.
+# Primitive matchers charge one step per attempt and report how far they got;
+# `Alternative` and `Choice` charge one backtrack each time a branch fails and
+# the next one is tried. Combinators bottom out in primitive attempts, and
+# the generalized engine, which memoizes those attempts, charges a step for
+# every chart item and forest node it builds instead, so the step limit
+# bounds the total work of a parse.
+# Exhausting a budget raises `Exhausted`, which unwinds straight to the
+# `Budgeted` parser that set it. Budgets nest: a meter installed inside
+# another charges every step and backtrack to its parents as well, so an inner
+# `Budgeted` can tighten an outer limit but never lift it. With no meter
+# installed, each checkpoint costs a single context variable lookup.
+
+# The clock is read on the first step, then at doubling intervals of up to
+# this many steps, and once more when the parse returns, so a parse of few but
+# slow steps is still held to its deadline.
+_DEADLINE_INTERVAL: t.Final = 1024
+
+_meter = contextvars.ContextVar["Meter | None"]("compynators_meter", default=None)
+
+
+class BudgetExceeded(Enum):
+    Steps = 1
+    Backtracks = 2
+    Deadline = 3
+
+
+@dataclass(frozen=True)
+class Budget:
+    max_steps: int | None = None
+    max_backtracks: int | None = None
+    timeout: float | None = None
+
+    def meter(self, position: int, parent: "Meter | None" = None) -> "Meter":
+        return Meter(self, position, parent)
+
+
+class Exhausted(Exception):
+    def __init__(self, kind: BudgetExceeded, meter: "Meter") -> None:
+        super().__init__(kind)
+        self.kind = kind
+        self.meter = meter
+
+
+class Meter:
+    __slots__ = (
+        "steps",
+        "backtracks",
+        "deadline",
+        "countdown",
+        "interval",
+        "furthest",
+        "parent",
+    )
+
+    def __init__(
+        self, budget: Budget, position: int, parent: "Meter | None" = None
+    ) -> None:
+        self.parent = parent
+        self.steps = budget.max_steps
+        self.backtracks = budget.max_backtracks
+        self.deadline = (
+            None if budget.timeout is None else time.monotonic() + budget.timeout
+        )
+        self.countdown = 1
+        self.interval = 1
+        self.furthest = position
+
+    def step(self, position: int) -> None:
+        meter: Meter | None = self
+        while meter is not None:
+            if position > meter.furthest:
+                meter.furthest = position
+
+            if meter.steps is not None:
+                meter.steps -= 1
+                if meter.steps < 0:
+                    raise Exhausted(BudgetExceeded.Steps, meter)
+
+            if meter.deadline is not None:
+                meter.countdown -= 1
+                if meter.countdown == 0:
+                    meter.interval = min(meter.interval * 2, _DEADLINE_INTERVAL)
+                    meter.countdown = meter.interval
+                    if time.monotonic() > meter.deadline:
+                        raise Exhausted(BudgetExceeded.Deadline, meter)
+
+            meter = meter.parent
+
+    def check_deadline(self) -> None:
+        meter: Meter | None = self
+        while meter is not None:
+            if meter.deadline is not None and time.monotonic() > meter.deadline:
+                raise Exhausted(BudgetExceeded.Deadline, meter)
+            meter = meter.parent
+
+    def backtrack(self) -> None:
+        meter: Meter | None = self
+        while meter is not None:
+            if meter.backtracks is not None:
+                meter.backtracks -= 1
+                if meter.backtracks < 0:
+                    raise Exhausted(BudgetExceeded.Backtracks, meter)
+            meter = meter.parent
+
+
+def active() -> Meter | None:
+    return _meter.get()
+
+
+@contextlib.contextmanager
+def metering(meter: Meter) -> t.Generator[Meter, None, None]:
+    token = _meter.set(meter)
+    try:
+        yield meter
+    finally:
+        _meter.reset(token)
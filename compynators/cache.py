@@ -0,0 +1,289 @@
+import typing as t
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+import hashlib
+import os
+import pathlib
+import pickle
+import sys
+import threading
+import types
+
+from combinators import Parser, ParseResultType, PR
+from stream import Stream
+
+# Content-addressed cache of parse results.
+#
+# Entries are keyed on the grammar and a hash of the source text, and evicted
+# least recently used first once either the entry count or the total retained
+# size goes over its bound. The retained size of an entry is measured once, on
+# insertion, by walking everything its result keeps alive: the output values
+# and the remaining `Stream` with its source and offset columns.
+#
+# Files are additionally remembered by mtime and size, so an unchanged file is
+# neither read nor hashed again. Results that pickle can be persisted to a
+# directory, for which the grammar needs a stable `grammar_key`; in memory the
+# parser object itself identifies the grammar and is kept alive only while the
+# cache holds entries for it.
+#
+# Cached results are shared between callers and must not be mutated. The key
+# leaves out the file a source came from, so a hit hands back a result whose
+# remaining stream names the caller's file.
+
+type _Key = tuple[str, str]
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    disk_hits: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+
+@dataclass
+class _Entry:
+    result: ParseResultType[t.Any, t.Any, t.Any]
+    size: int
+
+
+@dataclass
+class _FileState:
+    mtime_ns: int
+    size: int
+    digest: str
+
+
+class ParseCache:
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 64 * 1024 * 1024,
+        directory: os.PathLike[str] | str | None = None,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.directory = None if directory is None else pathlib.Path(directory)
+        self.stats = CacheStats()
+
+        self._entries = OrderedDict[_Key, _Entry]()
+        self._files = dict[tuple[str, str], _FileState]()
+        # Keeps parsers keyed by `id` alive while they have entries, so their
+        # ids are not reused.
+        self._grammars = dict[str, Parser[t.Any, t.Any, t.Any]]()
+        self._counts = dict[str, int]()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def parse[Out, Err](
+        self,
+        parser: Parser[str, Out, Err],
+        source: str,
+        file_handle: os.PathLike[str] | None = None,
+        grammar_key: str | None = None,
+    ) -> ParseResultType[str, Out, Err]:
+        return self._lookup(parser, source, _digest(source), file_handle, grammar_key)
+
+    def parse_file[Out, Err](
+        self,
+        parser: Parser[str, Out, Err],
+        path: os.PathLike[str],
+        grammar_key: str | None = None,
+        encoding: str = "utf-8",
+    ) -> ParseResultType[str, Out, Err]:
+        grammar = self._grammar(parser, grammar_key)
+        stat = os.stat(path)
+        file_key = (os.fspath(path), grammar)
+
+        with self._lock:
+            state = self._files.get(file_key)
+            if (
+                state is not None
+                and state.mtime_ns == stat.st_mtime_ns
+                and state.size == stat.st_size
+            ):
+                entry = self._entries.get((grammar, state.digest))
+                if entry is not None:
+                    self._entries.move_to_end((grammar, state.digest))
+                    self.stats.hits += 1
+                    return _for_file(entry.result, path)
+            elif state is not None:
+                self.stats.invalidations += 1
+
+        source = pathlib.Path(path).read_text(encoding=encoding)
+        digest = _digest(source)
+        with self._lock:
+            self._files[file_key] = _FileState(stat.st_mtime_ns, stat.st_size, digest)
+
+        return self._lookup(parser, source, digest, path, grammar_key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._files.clear()
+            self._grammars.clear()
+            self._counts.clear()
+            self._bytes = 0
+
+    def _grammar(
+        self, parser: Parser[t.Any, t.Any, t.Any], grammar_key: str | None
+    ) -> str:
+        # The caller holds `parser` until its entry is inserted, and the entry
+        # then keeps it alive, so its `id` stays unique for as long as it is
+        # part of a key.
+        if grammar_key is not None:
+            return grammar_key
+        return f"{type(parser).__name__}@{id(parser):x}"
+
+    def _lookup[Out, Err](
+        self,
+        parser: Parser[str, Out, Err],
+        source: str,
+        digest: str,
+        file_handle: os.PathLike[str] | None,
+        grammar_key: str | None,
+    ) -> ParseResultType[str, Out, Err]:
+        key = (self._grammar(parser, grammar_key), digest)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+                return _for_file(entry.result, file_handle)
+
+        result = self._load(key) if grammar_key is not None else None
+        if result is not None:
+            with self._lock:
+                self.stats.disk_hits += 1
+        else:
+            with self._lock:
+                self.stats.misses += 1
+            result = parser.parse(Stream.from_source(source, file_handle))
+            if grammar_key is not None:
+                self._store(key, result)
+
+        entry = _Entry(result, _retained_size(result))
+        with self._lock:
+            if grammar_key is None:
+                self._grammars[key[0]] = parser
+            self._insert(key, entry)
+        return _for_file(result, file_handle)
+
+    def _insert(self, key: _Key, entry: _Entry) -> None:
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= previous.size
+        else:
+            self._counts[key[0]] = self._counts.get(key[0], 0) + 1
+
+        self._entries[key] = entry
+        self._bytes += entry.size
+
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            (grammar, _), evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
+            self.stats.evictions += 1
+            self._counts[grammar] -= 1
+            if not self._counts[grammar]:
+                self._forget(grammar)
+
+    def _forget(self, grammar: str) -> None:
+        # The last entry for `grammar` is gone: release its parser and the
+        # file states that could only have led to its entries.
+        del self._counts[grammar]
+        self._grammars.pop(grammar, None)
+        for file_key in [key for key in self._files if key[1] == grammar]:
+            del self._files[file_key]
+
+    def _path(self, key: _Key) -> pathlib.Path | None:
+        if self.directory is None:
+            return None
+        grammar, digest = key
+        return self.directory / _digest(grammar) / f"{digest}.pickle"
+
+    def _load(self, key: _Key) -> ParseResultType[t.Any, t.Any, t.Any] | None:
+        path = self._path(key)
+        if path is None or not path.exists():
+            return None
+        try:
+            with path.open("rb") as file:
+                return pickle.load(file)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            return None
+
+    def _store(self, key: _Key, result: ParseResultType[t.Any, t.Any, t.Any]) -> None:
+        path = self._path(key)
+        if path is None:
+            return
+        try:
+            data = pickle.dumps(result)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            # Results holding lambdas, open files and the like stay in memory.
+            return
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        partial.write_bytes(data)
+        partial.replace(path)
+
+
+def _for_file[Out, Err](
+    result: ParseResultType[str, Out, Err], file_handle: os.PathLike[str] | None
+) -> ParseResultType[str, Out, Err]:
+    match result:
+        case PR.Match(item, remaining) if remaining.file_handle != file_handle:
+            # Shares the columns; only the stream header is rebuilt.
+            return PR.Match(item, replace(remaining, file_handle=file_handle))
+        case _:
+            return result
+
+
+def _digest(text: str) -> str:
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+
+# Shared by every entry, or not owned by the result at all.
+_SHARED: t.Final = (
+    type,
+    types.ModuleType,
+    types.FunctionType,
+    types.BuiltinFunctionType,
+    types.MethodType,
+    Parser,
+)
+
+
+def _retained_size(result: object) -> int:
+    # Approximate bytes kept alive by `result`, counting each object once.
+    seen = set[int]()
+    stack = [result]
+    size = 0
+
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, _SHARED):
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+
+        match obj:
+            case str() | bytes() | bytearray() | range() | int() | float():
+                pass
+            case dict():
+                stack.extend(t.cast(dict[object, object], obj).keys())
+                stack.extend(t.cast(dict[object, object], obj).values())
+            case list() | tuple() | set() | frozenset():
+                stack.extend(t.cast(t.Iterable[object], obj))
+            case _:
+                stack.extend(getattr(obj, "__dict__", {}).values())
+                for cls in type(obj).__mro__:
+                    slots = cls.__dict__.get("__slots__", ())
+                    for slot in (slots,) if isinstance(slots, str) else slots:
+                        if hasattr(obj, slot):
+                            stack.append(getattr(obj, slot))
+
+    return size
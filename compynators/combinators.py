@@ -1,15 +1,17 @@
 import typing as t
 import typing_extensions as te
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
 from abc import ABC, abstractmethod
-import copy
 from enum import Enum
 
 from bools import TrueType, FalseType
-from stream import Stream
+from stream import Cursor, Stream
 from union import Maybe, MaybeType
 import span
 from span import Span
+from scan import CharClass
+import deferred
+import budget
 
 type ParseResultType[In, Out, Err] = (
     ParseResult.Match[In, Out] | ParseResult.NoMatchType | ParseResult.Error[Err]
@@ -111,6 +113,21 @@ class ParseResult:
 PR = ParseResult
 
 
+# Raised, rather than returned, when a repetition matches without consuming
+# input: it is a bug in the grammar, not a parse failure, and it has no place
+# in a grammar's own error type.
+class NoProgress(Exception):
+    def __init__(self, span: Span) -> None:
+        super().__init__(f"Repetition matched without consuming input at {span}")
+        self.span = span
+
+
+# Parsers are immutable once constructed: combinators are frozen dataclasses
+# and anything derived from their fields is built in `__post_init__`. All
+# per-parse state lives in the `Stream`, in the results, or in context
+# variables, so a single grammar can be shared by any number of threads
+# calling `parse` concurrently, including on free-threaded builds.
+# `Recursive.define` is the one mutation, and must happen before sharing.
 class Parser[In, Out, Err](ABC):
     @abstractmethod
     def parse(self, input: Stream[In]) -> ParseResultType[In, Out, Err]:
@@ -207,46 +224,153 @@ class Parser[In, Out, Err](ABC):
     def boolean(self) -> "Boolean[In, Err]":
         return Boolean(self)
 
+    @t.final
+    def deferred(self) -> "Deferred[In, Out, Err]":
+        return Deferred(self)
+
+    @t.final
+    def cursored(self) -> "Cursored[In, Out, Err]":
+        return Cursored(self)
+
+    @t.final
+    def budgeted(self, limits: budget.Budget) -> "Budgeted[In, Out, Err]":
+        return Budgeted(self, limits)
+
+
+def _pair[First, Second](first: First, second: Second) -> tuple[First, Second]:
+    return first, second
+
+
+def _list[Item](*items: Item) -> list[Item]:
+    return list(items)
+
+
+def _prepend[Item](first: Item, rest: list[Item]) -> list[Item]:
+    return [first, *rest]
+
+
+def _tuple[Item](*items: Item) -> tuple[Item, ...]:
+    return items
+
+
+# Copies caller-owned collections that a frozen parser holds on to, so that
+# mutating the original list or set later cannot change the grammar.
+def _frozen_sequence[Item](items: t.Sequence[Item]) -> t.Sequence[Item]:
+    if isinstance(items, str | bytes | tuple | range):
+        return t.cast(t.Sequence[Item], items)
+    return tuple(items)
+
+
+def _frozen_class[Item](char_class: CharClass[Item]) -> CharClass[Item]:
+    if callable(char_class):
+        return char_class
+    if isinstance(char_class, str | bytes | frozenset):
+        return t.cast(t.Collection[Item], char_class)
+    return frozenset(char_class)
+
+
+@dataclass(frozen=True)
+class Deferred[In, Out, Err](Parser[In, Out, Err]):
+    parser: Parser[In, Out, Err]
+
+    @t.override
+    def parse(self, input: Stream[In]) -> ParseResultType[In, Out, Err]:
+        if deferred.is_deferring():
+            return self.parser.parse(input)
+
+        with deferred.deferring():
+            result = self.parser.parse(input)
+
+        match result:
+            case PR.Match(item, pos):
+                return PR.Match(deferred.force(item), pos)
+            case no_match_or_err:
+                return no_match_or_err
+
+
+@dataclass(frozen=True)
+class Cursored[In, Out, Err](Parser[In, Out, Err]):
+    parser: Parser[In, Out, Err]
 
-@dataclass
+    @t.override
+    def parse(self, input: Stream[In]) -> ParseResultType[In, Out, Err]:
+        if isinstance(input, Cursor):
+            return self.parser.parse(input)
+
+        cursor = Cursor.at(input)
+        match self.parser.parse(cursor):
+            case PR.Match(item, _):
+                return PR.Match(item, input.advance(cursor.position - input.position))
+            case no_match_or_err:
+                return no_match_or_err
+
+
+@dataclass(frozen=True)
+class Budgeted[In, Out, Err](Parser[In, Out, Err | budget.BudgetExceeded]):
+    parser: Parser[In, Out, Err]
+    limits: budget.Budget
+
+    @t.override
+    def parse(
+        self, input: Stream[In]
+    ) -> ParseResultType[In, Out, Err | budget.BudgetExceeded]:
+        meter = self.limits.meter(input.position, budget.active())
+        try:
+            with budget.metering(meter):
+                result = self.parser.parse(input)
+                meter.check_deadline()
+        except budget.Exhausted as exc:
+            if exc.meter is not meter:
+                # An enclosing budget ran out; that `Budgeted` reports it.
+                raise
+            furthest = input.advance(meter.furthest - input.position)
+            return PR.Error(exc.kind, furthest.span_of(1))
+
+        match result:
+            case PR.Error(kind, span):
+                return PR.Error(kind, span)
+            case match_or_no_match:
+                return match_or_no_match
+
+
+@dataclass(frozen=True)
 class Require[In, Out, Err](Parser[In, Out, Err]):
     required: Parser[In, Out, Err]
     error: Err
 
     @t.override
     def parse(self, input: Stream[In]) -> ParseResultType[In, Out, Err]:
+        mark = input.mark()
         match self.required.parse(input):
             case PR.Match(item, pos):
                 return PR.Match(item, pos)
             case PR.NoMatch:
-                return PR.Error(self.error, input.spans[input.position - 1].span)
+                return PR.Error(self.error, input.span_at(mark - 1))
             case PR.Error() as errs:
                 return errs
 
 
-@dataclass
+@dataclass(frozen=True)
 class Spanned[In, Out, Err](Parser[In, span.Spanned[Out], Err]):
     parser: Parser[In, Out, Err]
 
     @t.override
     def parse(self, input: Stream[In]) -> ParseResultType[In, span.Spanned[Out], Err]:
+        mark = input.mark()
         match self.parser.parse(input):
             case PR.Match(item, pos):
-                return PR.Match(
-                    span.Spanned(
-                        item,
-                        input.spans[input.position].span
-                        + pos.spans[pos.position - 1].span,
-                    ),
-                    pos,
-                )
+                start = input.span_at(mark)
+                item_span = start + pos.span_at(pos.position - 1)
+                if deferred.is_lazy(item):
+                    return PR.Match(deferred.delay(span.Spanned, item, item_span), pos)
+                return PR.Match(span.Spanned(item, item_span), pos)
             case PR.NoMatch:
                 return PR.NoMatch
             case PR.Error() as err:
                 return err
 
 
-@dataclass
+@dataclass(frozen=True)
 class Alternative[In, FirstOut, SecondOut, Err](Parser[In, FirstOut | SecondOut, Err]):
     first_choice: Parser[In, FirstOut, Err]
     second_choice: Parser[In, SecondOut, Err]
@@ -255,11 +379,14 @@ class Alternative[In, FirstOut, SecondOut, Err](Parser[In, FirstOut | SecondOut,
     def parse(
         self, input: Stream[In]
     ) -> ParseResultType[In, FirstOut | SecondOut, Err]:
+        mark = input.mark()
         match self.first_choice.parse(input):
             case PR.Match(item, pos):
                 return PR.Match(item, pos)
             case PR.NoMatch:
-                ...
+                input.rewind(mark)
+                if (meter := budget.active()) is not None:
+                    meter.backtrack()
             case PR.Error() as errors:
                 return errors
 
@@ -272,7 +399,7 @@ class Alternative[In, FirstOut, SecondOut, Err](Parser[In, FirstOut | SecondOut,
                 return errors
 
 
-@dataclass
+@dataclass(frozen=True)
 class To[In, Out, Into, Err](Parser[In, Into, Err]):
     parser: Parser[In, Out, Err]
     convert_to: Into
@@ -288,7 +415,7 @@ class To[In, Out, Into, Err](Parser[In, Into, Err]):
                 return error
 
 
-@dataclass
+@dataclass(frozen=True)
 class Then[In, FirstOut, SecondOut, Err](Parser[In, tuple[FirstOut, SecondOut], Err]):
     first: Parser[In, FirstOut, Err]
     second: Parser[In, SecondOut, Err]
@@ -309,6 +436,12 @@ class Then[In, FirstOut, SecondOut, Err](Parser[In, tuple[FirstOut, SecondOut],
 
         match self.second.parse(first_result.remaining):
             case PR.Match(second_item, pos):
+                if deferred.is_lazy(first_result.item) or deferred.is_lazy(
+                    second_item
+                ):
+                    return PR.Match(
+                        deferred.delay(_pair, first_result.item, second_item), pos
+                    )
                 return PR.Match((first_result.item, second_item), pos)
             case PR.NoMatch:
                 return PR.NoMatch
@@ -316,7 +449,7 @@ class Then[In, FirstOut, SecondOut, Err](Parser[In, tuple[FirstOut, SecondOut],
                 return error
 
 
-@dataclass
+@dataclass(frozen=True)
 class ThenWithContext[In, Context, SecondOut, Err](
     Parser[In, tuple[Context, SecondOut], Err]
 ):
@@ -337,11 +470,13 @@ class ThenWithContext[In, Context, SecondOut, Err](
             case PR.Error() as err:
                 return err
 
-        context = first_result.item
+        context = deferred.force(first_result.item)
         first_pos = first_result.remaining
 
         match self.second(context, first_pos):
             case PR.Match(second_item, pos):
+                if deferred.is_lazy(second_item):
+                    return PR.Match(deferred.delay(_pair, context, second_item), pos)
                 return PR.Match((context, second_item), pos)
             case PR.NoMatch as nm:
                 return nm
@@ -349,7 +484,7 @@ class ThenWithContext[In, Context, SecondOut, Err](
                 return err
 
 
-@dataclass
+@dataclass(frozen=True)
 class IgnoreThen[In, IgnoreOut, Out, Err](Parser[In, Out, Err]):
     first: Parser[In, IgnoreOut, Err]
     second: Parser[In, Out, Err]
@@ -363,7 +498,7 @@ class IgnoreThen[In, IgnoreOut, Out, Err](Parser[In, Out, Err]):
                 return no_match_or_err
 
 
-@dataclass
+@dataclass(frozen=True)
 class ThenIgnore[In, Out, IgnoreOut, Err](Parser[In, Out, Err]):
     first: Parser[In, Out, Err]
     second: Parser[In, IgnoreOut, Err]
@@ -381,7 +516,55 @@ class ThenIgnore[In, Out, IgnoreOut, Err](Parser[In, Out, Err]):
                 return no_match_or_err
 
 
-@dataclass
+@dataclass(frozen=True)
+class Ignored[In, Err]:
+    parser: Parser[In, t.Any, Err]
+
+
+@dataclass(frozen=True)
+class Seq[In, Out, Err](Parser[In, Out, Err]):
+    # Runs `parsers` one after another and yields the items of those marked
+    # in `kept` as one flat tuple, or passes them to `into` as arguments.
+    # Unlike chained `then`s, no intermediate tuples or results are built.
+    parsers: tuple[Parser[In, t.Any, Err], ...]
+    kept: tuple[bool, ...]
+    into: t.Callable[..., Out] | None = None
+    _steps: tuple[tuple[Parser[In, t.Any, Err], bool], ...] = field(
+        init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        assert len(self.parsers) == len(self.kept), "One flag per parser"
+        object.__setattr__(self, "_steps", tuple(zip(self.parsers, self.kept)))
+
+    @t.override
+    def parse(self, input: Stream[In]) -> ParseResultType[In, Out, Err]:
+        items = list[t.Any]()
+        lazy = False
+        pos = input
+
+        for parser, keep in self._steps:
+            match parser.parse(pos):
+                case PR.Match(item, pos):
+                    if keep:
+                        items.append(item)
+                        lazy = lazy or deferred.is_lazy(item)
+                case PR.NoMatch:
+                    return PR.NoMatch
+                case PR.Error() as err:
+                    return err
+
+        if self.into is not None:
+            if deferred.is_deferring():
+                return PR.Match(deferred.delay(self.into, *items), pos)
+            return PR.Match(self.into(*items), pos)
+        # Without `into`, `seq` types `Out` as the tuple of kept items.
+        if lazy:
+            return PR.Match(t.cast(Out, deferred.delay(_tuple, *items)), pos)
+        return PR.Match(t.cast(Out, tuple(items)), pos)
+
+
+@dataclass(frozen=True)
 class SeparatedBy[In, Out, Sep, Err](Parser[In, list[Out], Err]):
     parser: Parser[In, Out, Err]
     separator: Parser[In, Sep, Err]
@@ -389,6 +572,15 @@ class SeparatedBy[In, Out, Sep, Err](Parser[In, list[Out], Err]):
     _allow_leading: bool = False
     _allow_trailing: bool = False
     _at_least: int = 0
+    _rest: "Parser[In, list[Out], Err]" = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        rest = (
+            self.separator.ignore_then(self.parser)
+            .repeated()
+            .at_least(self._at_least - 1)
+        )
+        object.__setattr__(self, "_rest", rest)
 
     @t.override
     def parse(self, input: Stream[In]) -> ParseResultType[In, list[Out], Err]:
@@ -412,13 +604,14 @@ class SeparatedBy[In, Out, Sep, Err](Parser[In, list[Out], Err]):
         #   3. If self._allow_trailing, try to parse a separator.
 
         pos = input
+        start = input.mark()
 
         if self._allow_leading:
             match self.separator.parse(pos):
                 case PR.Match(_, pos):
                     ...
                 case PR.NoMatch:
-                    ...
+                    input.rewind(start)
                 case PR.Error() as error:
                     return error
 
@@ -428,17 +621,12 @@ class SeparatedBy[In, Out, Sep, Err](Parser[In, list[Out], Err]):
             case PR.NoMatch:
                 if self._at_least > 0:
                     return PR.NoMatch
+                input.rewind(start)
                 return PR.Match([], input)
             case PR.Error() as error:
                 return error
 
-        rest = (
-            self.separator.ignore_then(self.parser)
-            .repeated()
-            .at_least(self._at_least - 1)
-        )
-
-        match rest.parse(pos):
+        match self._rest.parse(pos):
             case PR.Match(items, pos):
                 ...
             case PR.NoMatch:
@@ -446,78 +634,87 @@ class SeparatedBy[In, Out, Sep, Err](Parser[In, list[Out], Err]):
             case PR.Error() as error:
                 return error
 
-        items.insert(0, first_item)
+        if deferred.is_lazy(first_item) or deferred.is_lazy(items):
+            items = deferred.delay(_prepend, first_item, items)
+        else:
+            items.insert(0, first_item)
 
         if self._allow_trailing:
+            mark = pos.mark()
             match self.separator.parse(pos):
                 case PR.Match(_, pos):
                     ...
                 case PR.NoMatch:
-                    ...
+                    pos.rewind(mark)
                 case PR.Error() as error:
                     return error
 
         return PR.Match(items, pos)
 
     def allow_leading(self) -> t.Self:
-        other = copy.copy(self)
-        other._allow_leading = True
-        return other
+        return replace(self, _allow_leading=True)
 
     def allow_trailing(self) -> t.Self:
-        other = copy.copy(self)
-        other._allow_trailing = True
-        return other
+        return replace(self, _allow_trailing=True)
 
     def at_least(self, minimum: int) -> t.Self:
-        other = copy.copy(self)
-        other._at_least = minimum
-        return other
+        return replace(self, _at_least=minimum)
 
 
-@dataclass
+@dataclass(frozen=True)
 class DelimitedBy[In, Out, Start, End, Err](Parser[In, Out, Err]):
     parser: Parser[In, Out, Err]
     start: Parser[In, Start, Err]
     end: Parser[In, End, Err]
+    _delimited: Parser[In, Out, Err] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        delimited = self.start.ignore_then(self.parser).then_ignore(self.end)
+        object.__setattr__(self, "_delimited", delimited)
 
     @t.override
     def parse(self, input: Stream[In]) -> ParseResultType[In, Out, Err]:
-        return self.start.ignore_then(self.parser).then_ignore(self.end).parse(input)
+        return self._delimited.parse(input)
 
 
-@dataclass
+@dataclass(frozen=True)
 class OrNot[In, Out, Err](Parser[In, MaybeType[Out], Err]):
     maybe: Parser[In, Out, Err]
 
     @t.override
     def parse(self, input: Stream[In]) -> ParseResultType[In, MaybeType[Out], Err]:
+        mark = input.mark()
         match self.maybe.parse(input):
             case PR.Match(item, remaining):
+                if deferred.is_lazy(item):
+                    return PR.Match(deferred.delay(Maybe.Some, item), remaining)
                 return PR.Match(Maybe.Some(item), remaining)
             case PR.NoMatch:
+                input.rewind(mark)
                 return PR.Match(Maybe.Nil, input)
             case PR.Error() as errors:
                 return errors
 
 
-@dataclass
+@dataclass(frozen=True)
 class OrElse[In, Out, Err](Parser[In, Out, Err]):
     maybe: Parser[In, Out, Err]
     default: Out
 
     @t.override
     def parse(self, input: Stream[In]) -> ParseResultType[In, Out, Err]:
+        mark = input.mark()
         match self.maybe.parse(input):
             case PR.Match(item, remaining):
                 return PR.Match(item, remaining)
             case PR.NoMatch:
+                input.rewind(mark)
                 return PR.Match(self.default, input)
             case PR.Error() as errors:
                 return errors
 
 
-@dataclass
+@dataclass(frozen=True)
 class Map[In, Out, Mapped, Err](Parser[In, Mapped, Err]):
     parser: Parser[In, Out, Err]
     mapper: t.Callable[[Out], Mapped]
@@ -526,6 +723,8 @@ class Map[In, Out, Mapped, Err](Parser[In, Mapped, Err]):
     def parse(self, input: Stream[In]) -> ParseResultType[In, Mapped, Err]:
         match self.parser.parse(input):
             case PR.Match(item, pos):
+                if deferred.is_deferring():
+                    return PR.Match(deferred.delay(self.mapper, item), pos)
                 return PR.Match(self.mapper(item), pos)
             case PR.NoMatch:
                 return PR.NoMatch
@@ -533,22 +732,24 @@ class Map[In, Out, Mapped, Err](Parser[In, Mapped, Err]):
                 return errors
 
 
-@dataclass
+@dataclass(frozen=True)
 class Filter[In, Err](Parser[In, In, Err]):
     func: t.Callable[[In], bool]
 
     @t.override
     def parse(self, input: Stream[In]) -> ParseResultType[In, In, Err]:
-        match input.peek():
-            case Maybe.Some(spanned):
-                if self.func(spanned.item):
-                    return PR.Match(spanned.item, input.advance())
+        if (meter := budget.active()) is not None:
+            meter.step(input.position)
+        match input.peek_item():
+            case Maybe.Some(item):
+                if self.func(item):
+                    return PR.Match(item, input.advance())
                 return PR.NoMatch
             case Maybe.Nil:
                 return PR.NoMatch
 
 
-@dataclass
+@dataclass(frozen=True)
 class AndCheck[In, Out, Err](Parser[In, Out, Err]):
     parser: Parser[In, Out, Err]
     predicate: t.Callable[[Out], bool]
@@ -557,7 +758,7 @@ class AndCheck[In, Out, Err](Parser[In, Out, Err]):
     def parse(self, input: Stream[In]) -> ParseResultType[In, Out, Err]:
         match self.parser.parse(input):
             case PR.Match(item, remaining):
-                if self.predicate(item):
+                if self.predicate(deferred.force(item)):
                     return PR.Match(item, remaining)
                 return PR.NoMatch
             case PR.NoMatch:
@@ -566,7 +767,7 @@ class AndCheck[In, Out, Err](Parser[In, Out, Err]):
                 return errors
 
 
-@dataclass
+@dataclass(frozen=True)
 class Repeated[In, Out, Err](Parser[In, list[Out], Err]):
     parser: Parser[In, Out, Err]
     _at_least: int = 0
@@ -574,102 +775,180 @@ class Repeated[In, Out, Err](Parser[In, list[Out], Err]):
     @t.override
     def parse(self, input: Stream[In]) -> ParseResultType[In, list[Out], Err]:
         items = list[Out]()
+        lazy = False
 
         while True:
+            mark = input.mark()
             match self.parser.parse(input):
                 case PR.Match(item, pos):
+                    if pos.position == mark:
+                        # Matching again from the same place would match the
+                        # same way forever.
+                        raise NoProgress(pos.span_of(1))
                     input = pos
                     items.append(item)
+                    lazy = lazy or deferred.is_lazy(item)
                 case PR.NoMatch:
+                    input.rewind(mark)
                     if len(items) < self._at_least:
                         return PR.NoMatch
+                    if lazy:
+                        return PR.Match(deferred.delay(_list, *items), input)
                     return PR.Match(items, input)
                 case PR.Error() as err:
                     return err
 
     def at_least(self, minimum: int) -> t.Self:
-        other = copy.copy(self)
-        other._at_least = minimum
-        return other
+        return replace(self, _at_least=minimum)
 
 
-@dataclass
+@dataclass(frozen=True)
 class OneOf[In, Err](Parser[In, In, Err]):
     choices: t.Sequence[In]
 
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "choices", _frozen_sequence(self.choices))
+
     @t.override
     def parse(self, input: Stream[In]) -> ParseResultType[In, In, Err]:
-        match input.peek():
-            case Maybe.Some(spanned):
-                if spanned.item in self.choices:
-                    return PR.Match(spanned.item, input.advance())
+        if (meter := budget.active()) is not None:
+            meter.step(input.position)
+        match input.peek_item():
+            case Maybe.Some(item):
+                if item in self.choices:
+                    return PR.Match(item, input.advance())
                 return PR.NoMatch
             case Maybe.Nil:
                 return PR.NoMatch
 
 
-@dataclass
+@dataclass(frozen=True)
 class Just[In, Err](Parser[In, In, Err]):
     pattern: In
 
     @t.override
     def parse(self, input: Stream[In]) -> ParseResultType[In, In, Err]:
-        match input.peek():
-            case Maybe.Some(spanned):
-                if spanned.item == self.pattern:
+        if (meter := budget.active()) is not None:
+            meter.step(input.position)
+        match input.peek_item():
+            case Maybe.Some(item):
+                if item == self.pattern:
                     return PR.Match(self.pattern, input.advance())
                 return PR.NoMatch
             case Maybe.Nil:
                 return PR.NoMatch
 
 
-@dataclass
+@dataclass(frozen=True)
 class Nothing[In, Err](Parser[In, MaybeType[In], Err]):
     @t.override
     def parse(self, input: Stream[In]) -> ParseResultType[In, MaybeType[In], Err]:
-        match input.peek():
+        if (meter := budget.active()) is not None:
+            meter.step(input.position)
+        match input.peek_item():
             case Maybe.Some():
                 return PR.NoMatch
             case Maybe.Nil:
                 return PR.Match(Maybe.Nil, input.advance())
 
 
-@dataclass
+@dataclass(frozen=True)
 class Boolean[In, Err](Parser[In, bool, Err]):
     parser: Parser[In, t.Any, Err]
 
     @t.override
     def parse(self, input: Stream[In]) -> ParseResultType[In, bool, Err]:
+        mark = input.mark()
         match self.parser.parse(input):
             case PR.Match(_, pos):
                 return PR.Match(True, pos)
             case PR.NoMatch:
+                input.rewind(mark)
                 return PR.Match(False, input)
             case PR.Error() as err:
                 return err
 
 
-@dataclass
+@dataclass(frozen=True)
 class StartsWith[In](Parser[In, t.Sequence[In], t.Any]):
     pattern: t.Sequence[In]
 
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "pattern", _frozen_sequence(self.pattern))
+
     @t.override
     def parse(self, input: Stream[In]) -> ParseResultType[In, t.Sequence[In], t.Any]:
+        if (meter := budget.active()) is not None:
+            meter.step(input.position)
         if input.startswith(self.pattern):
             return PR.Match(self.pattern, input.advance(len(self.pattern)))
         return PR.NoMatch
 
 
-@dataclass
+@dataclass(frozen=True)
+class TakeWhile[In, Err](Parser[In, span.Spanned[t.Sequence[In]], Err]):
+    char_class: CharClass[In]
+    _at_least: int = 0
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "char_class", _frozen_class(self.char_class))
+
+    @t.override
+    def parse(
+        self, input: Stream[In]
+    ) -> ParseResultType[In, span.Spanned[t.Sequence[In]], Err]:
+        if (meter := budget.active()) is not None:
+            meter.step(input.position)
+        length = input.run_length(self.char_class)
+        if length < self._at_least:
+            return PR.NoMatch
+        return PR.Match(
+            span.Spanned(input.slice(length), input.span_of(length)),
+            input.advance(length),
+        )
+
+    def at_least(self, minimum: int) -> t.Self:
+        return replace(self, _at_least=minimum)
+
+
+@dataclass(frozen=True)
+class SkipWhile[In, Err](Parser[In, Span, Err]):
+    char_class: CharClass[In]
+    _at_least: int = 0
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "char_class", _frozen_class(self.char_class))
+
+    @t.override
+    def parse(self, input: Stream[In]) -> ParseResultType[In, Span, Err]:
+        if (meter := budget.active()) is not None:
+            meter.step(input.position)
+        length = input.run_length(self.char_class)
+        if length < self._at_least:
+            return PR.NoMatch
+        return PR.Match(input.span_of(length), input.advance(length))
+
+    def at_least(self, minimum: int) -> t.Self:
+        return replace(self, _at_least=minimum)
+
+
+@dataclass(frozen=True)
 class Choice[In, Out, Err](Parser[In, Out, Err]):
     choices: t.Iterable[Parser[In, Out, Err]]
 
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "choices", tuple(self.choices))
+
     def parse(self, input: Stream[In]) -> ParseResultType[In, Out, Err]:
+        mark = input.mark()
         for choice in self.choices:
             match choice.parse(input):
                 case PR.Match(item, pos):
                     return PR.Match(item, pos)
                 case PR.NoMatch:
+                    input.rewind(mark)
+                    if (meter := budget.active()) is not None:
+                        meter.backtrack()
                     continue
                 case PR.Error() as errors:
                     return errors
@@ -677,6 +956,28 @@ class Choice[In, Out, Err](Parser[In, Out, Err]):
         return PR.NoMatch
 
 
+@dataclass(frozen=True, eq=False)
+class Recursive[In, Out, Err](Parser[In, Out, Err]):
+    _parser: Parser[In, Out, Err] | None = None
+
+    @t.override
+    def parse(self, input: Stream[In]) -> ParseResultType[In, Out, Err]:
+        assert self._parser is not None, "Recursive parser used before definition"
+        return self._parser.parse(input)
+
+    def define(self, parser: Parser[In, Out, Err]) -> None:
+        assert self._parser is None, "Recursive parser is already defined"
+        object.__setattr__(self, "_parser", parser)
+
+
+def recursive[In, Out, Err](
+    func: t.Callable[[Parser[In, Out, Err]], Parser[In, Out, Err]],
+) -> Recursive[In, Out, Err]:
+    parser = Recursive[In, Out, Err]()
+    parser.define(func(parser))
+    return parser
+
+
 def startswith[In](pattern: t.Sequence[In]) -> StartsWith[In]:
     return StartsWith(pattern)
 
@@ -693,3 +994,80 @@ def choice[In, Out, Err](
 
 def one_of[In](choices: t.Sequence[In]) -> OneOf[In, t.Any]:
     return OneOf(choices)
+
+
+def take_while[In](char_class: CharClass[In]) -> TakeWhile[In, t.Any]:
+    return TakeWhile(char_class)
+
+
+def skip_while[In](char_class: CharClass[In]) -> SkipWhile[In, t.Any]:
+    return SkipWhile(char_class)
+
+
+def ignore[In, Err](parser: Parser[In, t.Any, Err]) -> Ignored[In, Err]:
+    return Ignored(parser)
+
+
+# `seq` is typed per arity when every element is kept; with `ignore` markers
+# the kept positions are not known to the checker and the tuple is untyped.
+@t.overload
+def seq[In, Out, Err](
+    *elements: Parser[In, t.Any, Err] | Ignored[In, Err],
+    into: t.Callable[..., Out],
+) -> Seq[In, Out, Err]: ...
+
+
+@t.overload
+def seq[In, A, Err](a: Parser[In, A, Err], /) -> Seq[In, tuple[A], Err]: ...
+
+
+@t.overload
+def seq[In, A, B, Err](
+    a: Parser[In, A, Err], b: Parser[In, B, Err], /
+) -> Seq[In, tuple[A, B], Err]: ...
+
+
+@t.overload
+def seq[In, A, B, C, Err](
+    a: Parser[In, A, Err], b: Parser[In, B, Err], c: Parser[In, C, Err], /
+) -> Seq[In, tuple[A, B, C], Err]: ...
+
+
+@t.overload
+def seq[In, A, B, C, D, Err](
+    a: Parser[In, A, Err],
+    b: Parser[In, B, Err],
+    c: Parser[In, C, Err],
+    d: Parser[In, D, Err],
+    /,
+) -> Seq[In, tuple[A, B, C, D], Err]: ...
+
+
+@t.overload
+def seq[In, A, B, C, D, E, Err](
+    a: Parser[In, A, Err],
+    b: Parser[In, B, Err],
+    c: Parser[In, C, Err],
+    d: Parser[In, D, Err],
+    e: Parser[In, E, Err],
+    /,
+) -> Seq[In, tuple[A, B, C, D, E], Err]: ...
+
+
+@t.overload
+def seq[In, Err](
+    *elements: Parser[In, t.Any, Err] | Ignored[In, Err],
+    into: None = None,
+) -> Seq[In, tuple[t.Any, ...], Err]: ...
+
+
+def seq[In, Err](
+    *elements: Parser[In, t.Any, Err] | Ignored[In, Err],
+    into: t.Callable[..., t.Any] | None = None,
+) -> Seq[In, t.Any, Err]:
+    parsers = tuple(
+        element.parser if isinstance(element, Ignored) else element
+        for element in elements
+    )
+    kept = tuple(not isinstance(element, Ignored) for element in elements)
+    return Seq(parsers, kept, into)
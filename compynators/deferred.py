@@ -0,0 +1,91 @@
+import typing as t
+import contextlib
+import contextvars
+
+# Deferred semantic actions.
+#
+# While a parse runs in deferred mode, combinators that would call user code or
+# build values from user values (`Map`, `Spanned`, `Then`, `Repeated`, ...)
+# return a `Thunk` instead. Thunks hang off the parse results, so the ones
+# built on abandoned branches are simply dropped, and the committed result is
+# forced once at the end. Forcing evaluates arguments left to right before the
+# action itself, which is the order eager parsing would have used.
+
+_deferring = contextvars.ContextVar[bool]("compynators_deferring", default=False)
+
+
+class Thunk:
+    __slots__ = ("_func", "_args", "_value")
+
+    _UNFORCED: t.Final = object()
+
+    def __init__(self, func: t.Callable[..., t.Any], args: tuple[t.Any, ...]) -> None:
+        self._func: t.Callable[..., t.Any] | None = func
+        self._args = args
+        self._value: t.Any = Thunk._UNFORCED
+
+    def force(self) -> t.Any:
+        # Walks the thunk graph with an explicit stack rather than recursing,
+        # since a long left-nested chain (a Pratt loop, a `then` chain) builds
+        # thunks far deeper than the recursion limit.
+        stack: list[Thunk] = [self]
+        while stack:
+            thunk = stack[-1]
+            if thunk._value is not Thunk._UNFORCED:
+                stack.pop()
+                continue
+
+            pending = [
+                arg
+                for arg in thunk._args
+                if isinstance(arg, Thunk) and arg._value is Thunk._UNFORCED
+            ]
+            if pending:
+                # Reversed, so the leftmost argument is forced first.
+                stack.extend(reversed(pending))
+                continue
+
+            stack.pop()
+            assert thunk._func is not None
+            thunk._value = thunk._func(
+                *(arg._value if isinstance(arg, Thunk) else arg for arg in thunk._args)
+            )
+            # Release the captured values once the result is known.
+            thunk._func = None
+            thunk._args = ()
+
+        return self._value
+
+    def __repr__(self) -> str:
+        if self._value is Thunk._UNFORCED:
+            return f"Thunk({self._func!r}, {self._args!r})"
+        return f"Thunk(value={self._value!r})"
+
+
+def is_deferring() -> bool:
+    return _deferring.get()
+
+
+@contextlib.contextmanager
+def deferring() -> t.Generator[None, None, None]:
+    token = _deferring.set(True)
+    try:
+        yield
+    finally:
+        _deferring.reset(token)
+
+
+# Typed as `Any` because a thunk stands in for whatever value the combinator
+# would have produced.
+def delay(func: t.Callable[..., t.Any], *args: t.Any) -> t.Any:
+    return Thunk(func, args)
+
+
+def is_lazy(value: t.Any) -> bool:
+    return isinstance(value, Thunk)
+
+
+def force[T](value: T | Thunk) -> T:
+    if isinstance(value, Thunk):
+        return value.force()
+    return value
@@ -0,0 +1,529 @@
+import typing as t
+from collections import defaultdict
+from dataclasses import dataclass, field
+from enum import Enum
+
+from combinators import (
+    Alternative,
+    AndCheck,
+    Boolean,
+    Choice,
+    DelimitedBy,
+    IgnoreThen,
+    Map,
+    OrElse,
+    OrNot,
+    Parser,
+    ParseResultType,
+    PR,
+    Recursive,
+    Repeated,
+    Require,
+    SeparatedBy,
+    Seq,
+    Spanned,
+    Then,
+    ThenIgnore,
+    To,
+)
+from stream import Stream
+from union import Maybe
+import budget
+import deferred
+import span
+
+# Generalized (Earley) execution of an ordinary combinator graph.
+#
+# The graph is compiled once into a grammar whose rules have at most two
+# symbols. Leaf parsers (`Just`, `OneOf`, `Filter`, `StartsWith`, `TakeWhile`,
+# user subclasses, ...) are not expanded: they are run as deterministic
+# scanners at each position they are predicted. Every derivation is kept in a
+# chart that doubles as a binarized shared packed parse forest, so the parse is
+# worst-case cubic in the input length however ambiguous the grammar is.
+# Values are built afterwards, once per forest node, and a disambiguation hook
+# picks between the values of ambiguous nodes.
+
+type Disambiguate = t.Callable[[Parser[t.Any, t.Any, t.Any], list[t.Any]], t.Any]
+type _Action = t.Callable[[tuple[t.Any, ...], Stream[t.Any], int, int], t.Any]
+
+
+class _Failed(Enum):
+    Failed = 1
+
+
+_FAILED: t.Final = _Failed.Failed
+
+
+@dataclass(eq=False)
+class _Leaf:
+    parser: Parser[t.Any, t.Any, t.Any]
+
+
+@dataclass(eq=False)
+class _Symbol:
+    origin: Parser[t.Any, t.Any, t.Any]
+    # Helper symbols exist only to binarize a combinator; ambiguity inside them
+    # is resolved by taking the first derivation rather than asking the hook.
+    primary: bool = True
+    rules: list["_Rule"] = field(default_factory=list)
+
+
+@dataclass(eq=False)
+class _Rule:
+    head: _Symbol
+    body: tuple[_Symbol | _Leaf, ...]
+    action: _Action
+    check: t.Callable[[t.Any], bool] | None = None
+
+
+type _Node = tuple[_Symbol | _Leaf, int, int]
+type _Item = tuple[_Rule, int, int]
+
+
+def _first(values: tuple[t.Any, ...], *_: t.Any) -> t.Any:
+    return values[0]
+
+
+def _second(values: tuple[t.Any, ...], *_: t.Any) -> t.Any:
+    return values[1]
+
+
+def _pair(values: tuple[t.Any, ...], *_: t.Any) -> t.Any:
+    return values[0], values[1]
+
+
+def _constant(value: t.Any) -> _Action:
+    return lambda *_: value
+
+
+def _cons(values: tuple[t.Any, ...], *_: t.Any) -> t.Any:
+    return values[0], values[1]
+
+
+def _flatten(cons: t.Any) -> list[t.Any]:
+    items = list[t.Any]()
+    while cons is not None:
+        cons, item = cons
+        items.append(item)
+    items.reverse()
+    return items
+
+
+class _Compiler:
+    def __init__(self) -> None:
+        self.compiled: dict[int, _Symbol | _Leaf] = {}
+
+    def symbol(self, parser: Parser[t.Any, t.Any, t.Any]) -> _Symbol | _Leaf:
+        if id(parser) in self.compiled:
+            return self.compiled[id(parser)]
+
+        if not isinstance(
+            parser,
+            (
+                Then,
+                IgnoreThen,
+                ThenIgnore,
+                DelimitedBy,
+                Alternative,
+                Choice,
+                Map,
+                To,
+                Spanned,
+                AndCheck,
+                Require,
+                OrNot,
+                OrElse,
+                Boolean,
+                Repeated,
+                SeparatedBy,
+                Seq,
+                Recursive,
+            ),
+        ):
+            leaf = _Leaf(parser)
+            self.compiled[id(parser)] = leaf
+            return leaf
+
+        # Registered before compiling children so that cycles through
+        # `Recursive` resolve to this symbol.
+        head = _Symbol(parser)
+        self.compiled[id(parser)] = head
+        self.expand(head, parser)
+        return head
+
+    def helper(self, origin: Parser[t.Any, t.Any, t.Any]) -> _Symbol:
+        return _Symbol(origin, primary=False)
+
+    def rule(
+        self,
+        head: _Symbol,
+        body: tuple[_Symbol | _Leaf, ...],
+        action: _Action,
+        check: t.Callable[[t.Any], bool] | None = None,
+    ) -> None:
+        head.rules.append(_Rule(head, body, action, check))
+
+    def expand(self, head: _Symbol, parser: Parser[t.Any, t.Any, t.Any]) -> None:
+        match parser:
+            case Then(first, second):
+                self.rule(head, (self.symbol(first), self.symbol(second)), _pair)
+            case IgnoreThen(first, second):
+                self.rule(head, (self.symbol(first), self.symbol(second)), _second)
+            case ThenIgnore(first, second):
+                self.rule(head, (self.symbol(first), self.symbol(second)), _first)
+            case DelimitedBy(inner, start, end):
+                body = self.helper(parser)
+                self.rule(body, (self.symbol(inner), self.symbol(end)), _first)
+                self.rule(head, (self.symbol(start), body), _second)
+            case Alternative(first_choice, second_choice):
+                self.rule(head, (self.symbol(first_choice),), _first)
+                self.rule(head, (self.symbol(second_choice),), _first)
+            case Choice(choices):
+                for choice in choices:
+                    self.rule(head, (self.symbol(choice),), _first)
+            case Map(inner, mapper):
+                self.rule(head, (self.symbol(inner),), lambda v, *_: mapper(v[0]))
+            case To(inner, convert_to):
+                self.rule(head, (self.symbol(inner),), _constant(convert_to))
+            case Spanned(inner):
+                self.rule(
+                    head,
+                    (self.symbol(inner),),
+                    lambda v, input, i, j: span.Spanned(
+                        v[0], input.span_at(i) + input.span_at(j - 1)
+                    ),
+                )
+            case AndCheck(inner, predicate):
+                self.rule(head, (self.symbol(inner),), _first, predicate)
+            case Require(required, _):
+                self.rule(head, (self.symbol(required),), _first)
+            case OrNot(maybe):
+                self.rule(head, (self.symbol(maybe),), lambda v, *_: Maybe.Some(v[0]))
+                self.rule(head, (), _constant(Maybe.Nil))
+            case OrElse(maybe, default):
+                self.rule(head, (self.symbol(maybe),), _first)
+                self.rule(head, (), _constant(default))
+            case Boolean(inner):
+                self.rule(head, (self.symbol(inner),), _constant(True))
+                self.rule(head, (), _constant(False))
+            case Repeated(inner, at_least):
+                self.rule(
+                    head,
+                    (self.repetition(parser, self.symbol(inner)),),
+                    lambda v, *_: _flatten(v[0]),
+                    lambda items: len(items) >= at_least,
+                )
+            case SeparatedBy():
+                self.separated_by(head, parser)
+            case Seq():
+                self.seq(head, parser)
+            case Recursive(inner):
+                assert inner is not None, "Recursive parser used before definition"
+                self.rule(head, (self.symbol(inner),), _first)
+            case _:
+                assert False, f"No expansion for {type(parser).__name__}"
+
+    def repetition(
+        self, origin: Parser[t.Any, t.Any, t.Any], element: _Symbol | _Leaf
+    ) -> _Symbol:
+        # Left recursive, which Earley handles in linear space per position.
+        # Values are cons cells so building a long list stays linear.
+        items = self.helper(origin)
+        self.rule(items, (), _constant(None))
+        self.rule(items, (items, element), _cons)
+        return items
+
+    def seq(self, head: _Symbol, parser: Seq[t.Any, t.Any, t.Any]) -> None:
+        # Binarized as a left-nested chain of cons cells, one helper per step.
+        prefix = self.helper(parser)
+        self.rule(prefix, (), _constant(None))
+        for element in parser.parsers:
+            longer = self.helper(parser)
+            self.rule(longer, (prefix, self.symbol(element)), _cons)
+            prefix = longer
+
+        kept = parser.kept
+        into = parser.into
+
+        def build(values: tuple[t.Any, ...], *_: t.Any) -> t.Any:
+            items = [item for item, keep in zip(_flatten(values[0]), kept) if keep]
+            if into is not None:
+                return into(*items)
+            return tuple(items)
+
+        self.rule(head, (prefix,), build)
+
+    def separated_by(
+        self, head: _Symbol, parser: SeparatedBy[t.Any, t.Any, t.Any, t.Any]
+    ) -> None:
+        item = self.symbol(parser.parser)
+        separator = self.symbol(parser.separator)
+
+        rest = self.helper(parser)
+        self.rule(rest, (separator, item), _second)
+
+        items = self.helper(parser)
+        self.rule(items, (item,), lambda v, *_: (None, v[0]))
+        self.rule(items, (items, rest), _cons)
+
+        optional_separator = self.helper(parser)
+        self.rule(optional_separator, (), _constant(None))
+        self.rule(optional_separator, (separator,), _constant(None))
+
+        body = self.helper(parser)
+        self.rule(body, (items,), lambda v, *_: _flatten(v[0]))
+        if parser._at_least <= 0:
+            self.rule(body, (), _constant([]))
+
+        if parser._allow_leading:
+            leading = self.helper(parser)
+            self.rule(leading, (optional_separator, body), _second)
+            body = leading
+
+        if parser._allow_trailing:
+            self.rule(head, (body, optional_separator), _first)
+        else:
+            self.rule(head, (body,), _first)
+
+        at_least = parser._at_least
+        for rule in head.rules:
+            rule.check = lambda items: len(items) >= at_least
+
+
+@dataclass
+class _Chart:
+    input: Stream[t.Any]
+    # For each end position, every item and the positions at which its last
+    # symbol started. This is the packed forest: items are shared, and each
+    # split point is one packed alternative.
+    sets: defaultdict[int, dict[_Item, set[int]]] = field(
+        default_factory=lambda: defaultdict(dict)
+    )
+    leaves: dict[tuple[int, int], tuple[t.Any, int] | None] = field(
+        default_factory=dict
+    )
+    error: PR.Error[t.Any] | None = None
+    # `Require` symbols by the position they were predicted at, and the ones
+    # that completed from there.
+    required: dict[tuple[int, int], _Symbol] = field(default_factory=dict)
+    fulfilled: set[tuple[int, int]] = field(default_factory=set)
+
+    def scan(self, leaf: _Leaf, position: int) -> tuple[t.Any, int] | None:
+        key = (id(leaf), position)
+        if key in self.leaves:
+            return self.leaves[key]
+
+        match leaf.parser.parse(self.input.advance(position - self.input.position)):
+            case PR.Match(item, pos):
+                # Leaves that defer (`Precedence`, `ThenWithContext`, ...)
+                # return thunks, but actions run on plain values.
+                scanned = deferred.force(item), pos.position
+            case PR.NoMatch:
+                scanned = None
+            case PR.Error() as error:
+                if self.error is None or error.span.end > self.error.span.end:
+                    self.error = error
+                scanned = None
+
+        self.leaves[key] = scanned
+        return scanned
+
+
+@dataclass(frozen=True)
+class Generalized[In, Out, Err](Parser[In, Out, Err]):
+    parser: Parser[In, Out, Err]
+    disambiguate: Disambiguate | None = None
+    _start: _Symbol = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        compiler = _Compiler()
+        start = _Symbol(self.parser, primary=False)
+        start.rules.append(_Rule(start, (compiler.symbol(self.parser),), _first))
+        object.__setattr__(self, "_start", start)
+
+    @t.override
+    def parse(self, input: Stream[In]) -> ParseResultType[In, Out, Err]:
+        origin = input.mark()
+        chart = self._recognize(input)
+        # Scanning leaves moves a `Cursor` input around; put it back first.
+        input.rewind(origin)
+
+        unfulfilled = self._unfulfilled(chart)
+
+        for end in sorted(chart.sets, reverse=True):
+            if (self._start.rules[0], 1, origin) not in chart.sets[end]:
+                continue
+            value = self._evaluate(chart, (self._start, origin, end))
+            if value is _FAILED:
+                continue
+            # A derivation got past `end` and then failed a `Require`; the
+            # backtracking engine stops there with the error instead of
+            # settling for the shorter match, as a repetition would.
+            beyond = [error for position, error in unfulfilled if position > end]
+            if beyond:
+                return max(beyond, key=lambda error: error.span.end)
+            return PR.Match(value, input.advance(end - origin))
+
+        errors = [chart.error] if chart.error is not None else []
+        errors.extend(error for _, error in unfulfilled)
+        if errors:
+            return max(errors, key=lambda error: error.span.end)
+        return PR.NoMatch
+
+    def _unfulfilled(self, chart: _Chart) -> list[tuple[int, PR.Error[t.Any]]]:
+        # Failed `Require`s by the position they were tried at. One at or
+        # before the end of a successful derivation does not end the parse,
+        # since another branch may still match where backtracking would have
+        # stopped. Its error points where `Require.parse` would have put it.
+        errors = list[tuple[int, PR.Error[t.Any]]]()
+        for key, symbol in chart.required.items():
+            if key in chart.fulfilled:
+                continue
+            assert isinstance(symbol.origin, Require)
+            _, position = key
+            error = PR.Error(symbol.origin.error, chart.input.span_at(position - 1))
+            errors.append((position, error))
+        return errors
+
+    def _recognize(self, input: Stream[In]) -> _Chart:
+        chart = _Chart(input)
+        waiting = defaultdict[int, defaultdict[_Symbol, list[_Item]]](
+            lambda: defaultdict(list)
+        )
+        # Symbols that completed without consuming input at a position. Items
+        # that start waiting on them afterwards are advanced straight away.
+        empty = defaultdict[int, set[_Symbol]](set)
+        worklist = list[_Item]()
+        meter = budget.active()
+
+        def add(position: int, item: _Item, split: int) -> None:
+            if meter is not None:
+                meter.step(position)
+            items = chart.sets[position]
+            if item in items:
+                items[item].add(split)
+                return
+            items[item] = {split}
+            if position == current:
+                worklist.append(item)
+
+        current = input.position
+        add(current, (self._start.rules[0], 0, current), current)
+
+        for current in range(input.position, len(input) + 1):
+            if current not in chart.sets:
+                continue
+            worklist = list(chart.sets[current])
+
+            while worklist:
+                rule, dot, origin = worklist.pop()
+
+                if dot == len(rule.body):
+                    if isinstance(rule.head.origin, Require):
+                        chart.fulfilled.add((id(rule.head), origin))
+                    if origin == current:
+                        empty[current].add(rule.head)
+                    for rule2, dot2, origin2 in list(waiting[origin][rule.head]):
+                        add(current, (rule2, dot2 + 1, origin2), origin)
+                    continue
+
+                match rule.body[dot]:
+                    case _Symbol() as symbol:
+                        expecting = waiting[current][symbol]
+                        if not expecting:
+                            if isinstance(symbol.origin, Require):
+                                chart.required[(id(symbol), current)] = symbol
+                            for predicted in symbol.rules:
+                                add(current, (predicted, 0, current), current)
+                        expecting.append((rule, dot, origin))
+                        if symbol in empty[current]:
+                            add(current, (rule, dot + 1, origin), current)
+                    case _Leaf() as leaf:
+                        scanned = chart.scan(leaf, current)
+                        if scanned is not None:
+                            add(scanned[1], (rule, dot + 1, origin), current)
+
+        return chart
+
+    def _derivations(
+        self, chart: _Chart, node: _Node
+    ) -> t.Generator[tuple[_Rule, tuple[_Node, ...]], None, None]:
+        symbol, start, end = node
+        assert isinstance(symbol, _Symbol)
+        items = chart.sets.get(end, {})
+
+        for rule in symbol.rules:
+            splits = items.get((rule, len(rule.body), start))
+            if splits is None:
+                continue
+            match rule.body:
+                case ():
+                    yield rule, ()
+                case (only,):
+                    yield rule, ((only, start, end),)
+                case (first, second):
+                    for split in sorted(splits):
+                        yield rule, ((first, start, split), (second, split, end))
+
+    def _evaluate(self, chart: _Chart, root: _Node) -> t.Any:
+        # Iterative post-order walk of the forest, so long repetitions do not
+        # hit the recursion limit. Edges back into a node that is still being
+        # walked come from cyclic derivations and are treated as failures.
+        values = dict[_Node, t.Any]()
+        visited = set[_Node]()
+        stack: list[tuple[_Node, bool]] = [(root, False)]
+        meter = budget.active()
+
+        while stack:
+            node, expanded = stack.pop()
+            if meter is not None:
+                meter.step(node[2])
+            if expanded:
+                values[node] = self._reduce(chart, node, values)
+                continue
+            if node in visited:
+                continue
+            visited.add(node)
+            stack.append((node, True))
+
+            if isinstance(node[0], _Leaf):
+                continue
+            for _, children in self._derivations(chart, node):
+                for child in children:
+                    if child not in visited:
+                        stack.append((child, False))
+
+        return values[root]
+
+    def _reduce(
+        self, chart: _Chart, node: _Node, values: dict[_Node, t.Any]
+    ) -> t.Any:
+        symbol, start, end = node
+
+        if isinstance(symbol, _Leaf):
+            scanned = chart.leaves.get((id(symbol), start))
+            if scanned is None or scanned[1] != end:
+                return _FAILED
+            return scanned[0]
+
+        candidates = list[t.Any]()
+        for rule, children in self._derivations(chart, node):
+            child_values = tuple(values.get(child, _FAILED) for child in children)
+            if any(value is _FAILED for value in child_values):
+                continue
+            value = rule.action(child_values, chart.input, start, end)
+            if rule.check is not None and not rule.check(value):
+                continue
+            candidates.append(value)
+
+        if not candidates:
+            return _FAILED
+        if len(candidates) == 1 or not symbol.primary or self.disambiguate is None:
+            return candidates[0]
+        return self.disambiguate(symbol.origin, candidates)
+
+
+def generalized[In, Out, Err](
+    parser: Parser[In, Out, Err], disambiguate: Disambiguate | None = None
+) -> Generalized[In, Out, Err]:
+    return Generalized(parser, disambiguate)
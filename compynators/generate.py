@@ -0,0 +1,331 @@
+import typing as t
+import math
+import random
+from dataclasses import dataclass
+
+from combinators import (
+    Alternative,
+    AndCheck,
+    Boolean,
+    Budgeted,
+    Choice,
+    Cursored,
+    Deferred,
+    DelimitedBy,
+    IgnoreThen,
+    Just,
+    Map,
+    Nothing,
+    OneOf,
+    OrElse,
+    OrNot,
+    Parser,
+    PR,
+    Recursive,
+    Repeated,
+    Require,
+    SeparatedBy,
+    Seq,
+    SkipWhile,
+    Spanned,
+    StartsWith,
+    TakeWhile,
+    Then,
+    ThenIgnore,
+    To,
+)
+from generalized import Generalized
+from pratt import Infix, Postfix, Precedence, Prefix
+from stream import Stream
+import graph
+
+# Grammar-driven input generation.
+#
+# The combinator graph is walked with an explicit stack, so each sentence is
+# produced as a stream of small text fragments and no sentence or corpus is
+# ever held in memory as a whole. Nesting depth counts how many `Recursive`
+# parsers are open. Once `max_depth` is reached, or a sentence has written
+# `sentence_bytes`, every choice takes the branch that closes the recursion
+# soonest, repetitions stop at their minimum and optional parts are left out.
+# The byte target is what bounds a sentence: a grammar with two recursive
+# operands per level grows exponentially in depth long before `max_depth`.
+# Closing only adds the shortest completion of the work already pending, so a
+# sentence overshoots its target by a bounded amount.
+#
+# Sentences follow the grammar read as a context-free grammar. Ordered choice
+# and `AndCheck` predicates can still reject some of them; pass `validate=True`
+# to `corpus` to re-parse each sentence and only keep the ones that parse.
+
+
+@dataclass(frozen=True)
+class Knobs:
+    max_depth: int = 32
+    sentence_bytes: int = 4096
+    min_repeat: int = 0
+    max_repeat: int = 4
+    optional: float = 0.5
+
+
+# Marks the point where one operand of a precedence table is to be expanded.
+class _Operand:
+    pass
+
+
+type _Work = (
+    Parser[str, t.Any, t.Any] | str | tuple[_Operand, Precedence[str, t.Any, t.Any]]
+)
+
+
+_OPERAND: t.Final = _Operand()
+
+
+def _closing_depths(root: Parser[str, t.Any, t.Any]) -> dict[int, float]:
+    # How many `Recursive` parsers must still be entered before each node can
+    # finish.
+    return graph.fixpoint(graph.reachable(root), math.inf, _closing_depth)
+
+
+def _closing_depth(
+    parser: Parser[str, t.Any, t.Any],
+    of: t.Callable[[Parser[str, t.Any, t.Any]], float],
+) -> float:
+    match parser:
+        case Alternative(first, second):
+            return min(of(first), of(second))
+        case Choice(choices):
+            return min((of(choice) for choice in choices), default=math.inf)
+        case OrNot() | OrElse() | Boolean():
+            return 0
+        case Repeated(inner, at_least):
+            return of(inner) if at_least > 0 else 0
+        case SeparatedBy(inner, separator):
+            return max(of(inner), of(separator)) if parser._at_least > 0 else 0
+        case Recursive(inner):
+            return math.inf if inner is None else 1 + of(inner)
+        case Precedence(atom):
+            return of(atom)
+        case _:
+            return max((of(child) for child in graph.children(parser)), default=0)
+
+
+class _Walker:
+    def __init__(
+        self,
+        parser: Parser[str, t.Any, t.Any],
+        rng: random.Random,
+        knobs: Knobs,
+    ) -> None:
+        self.parser = parser
+        self.rng = rng
+        self.knobs = knobs
+        self.depths = _closing_depths(parser)
+        self.target = knobs.sentence_bytes
+        self.written = 0
+
+    def sentence(self, target: int | None = None) -> t.Generator[str, None, None]:
+        stack: list[tuple[_Work, int]] = [(self.parser, 0)]
+        self.target = self.knobs.sentence_bytes if target is None else target
+        self.written = 0
+
+        while stack:
+            work, depth = stack.pop()
+            match work:
+                case str(fragment):
+                    if fragment:
+                        self.written += _byte_length(fragment)
+                        yield fragment
+                case (_Operand(), Precedence() as table):
+                    stack.extend(reversed(self.operand(table, depth)))
+                case Parser() as parser:
+                    stack.extend(reversed(self.expand(parser, depth)))
+
+    def expand(
+        self, parser: Parser[str, t.Any, t.Any], depth: int
+    ) -> list[tuple[_Work, int]]:
+        match parser:
+            case Just(pattern):
+                return [(pattern, depth)]
+            case OneOf(choices):
+                return [(self.rng.choice(list(choices)), depth)]
+            case StartsWith(pattern):
+                return [("".join(pattern), depth)]
+            case TakeWhile(char_class, at_least) | SkipWhile(char_class, at_least):
+                return [(self.run(parser, char_class, at_least, depth), depth)]
+            case Nothing():
+                return []
+            case (
+                Then(first, second)
+                | IgnoreThen(first, second)
+                | ThenIgnore(first, second)
+            ):
+                return [(first, depth), (second, depth)]
+            case DelimitedBy(inner, start, end):
+                return [(start, depth), (inner, depth), (end, depth)]
+            case Seq(parsers):
+                return [(inner, depth) for inner in parsers]
+            case Alternative(first, second):
+                return [(self.pick([first, second], depth), depth)]
+            case Choice(choices):
+                return [(self.pick(list(choices), depth), depth)]
+            case OrNot(inner) | OrElse(inner) | Boolean(inner):
+                if not self.optional(depth):
+                    return []
+                return [(inner, depth)]
+            case Repeated(inner, at_least):
+                return [(inner, depth)] * self.count(at_least, depth)
+            case SeparatedBy():
+                return self.separated(parser, depth)
+            case Recursive(inner):
+                assert inner is not None, "Recursive parser used before definition"
+                return [(inner, depth + 1)]
+            case Precedence(_, operators):
+                work: list[tuple[_Work, int]] = [((_OPERAND, parser), depth)]
+                infixes = [op for op in operators if isinstance(op, Infix)]
+                if infixes:
+                    for _ in range(self.count(0, depth)):
+                        work.append((self.rng.choice(infixes).op, depth))
+                        work.append(((_OPERAND, parser), depth))
+                return work
+            case (
+                Map(inner)
+                | To(inner)
+                | Spanned(inner)
+                | AndCheck(inner)
+                | Require(inner)
+                | Deferred(inner)
+                | Budgeted(inner)
+                | Cursored(inner)
+                | Generalized(inner)
+            ):
+                return [(inner, depth)]
+            case _:
+                raise TypeError(f"Cannot generate input for {type(parser).__name__}")
+
+    def closing(self, depth: int) -> bool:
+        return depth >= self.knobs.max_depth or self.written >= self.target
+
+    def pick(
+        self, choices: list[Parser[str, t.Any, t.Any]], depth: int
+    ) -> Parser[str, t.Any, t.Any]:
+        if self.closing(depth):
+            return min(choices, key=lambda choice: self.depths[id(choice)])
+        finite = [choice for choice in choices if self.depths[id(choice)] < math.inf]
+        return self.rng.choice(finite or choices)
+
+    def count(self, at_least: int, depth: int) -> int:
+        if self.closing(depth):
+            return at_least
+        low = max(at_least, self.knobs.min_repeat)
+        return self.rng.randint(low, max(low, self.knobs.max_repeat))
+
+    def run(
+        self,
+        parser: Parser[str, t.Any, t.Any],
+        char_class: t.Any,
+        at_least: int,
+        depth: int,
+    ) -> str:
+        if callable(char_class):
+            if at_least > 0:
+                raise ValueError(
+                    f"Cannot generate input for {type(parser).__name__} "
+                    "over a predicate"
+                )
+            return ""
+        chars = sorted(char_class)
+        length = self.count(at_least, depth)
+        return "".join(self.rng.choice(chars) for _ in range(length))
+
+    def separated(
+        self, parser: SeparatedBy[str, t.Any, t.Any, t.Any], depth: int
+    ) -> list[tuple[_Work, int]]:
+        work = list[tuple[_Work, int]]()
+        count = self.count(parser._at_least, depth)
+
+        if parser._allow_leading and count and self.optional(depth):
+            work.append((parser.separator, depth))
+        for index in range(count):
+            if index:
+                work.append((parser.separator, depth))
+            work.append((parser.parser, depth))
+        if parser._allow_trailing and count and self.optional(depth):
+            work.append((parser.separator, depth))
+
+        return work
+
+    def optional(self, depth: int) -> bool:
+        return not self.closing(depth) and self.rng.random() < self.knobs.optional
+
+    def operand(
+        self, table: Precedence[str, t.Any, t.Any], depth: int
+    ) -> list[tuple[_Work, int]]:
+        work = list[tuple[_Work, int]]()
+        prefixes = [op for op in table.operators if isinstance(op, Prefix)]
+        postfixes = [op for op in table.operators if isinstance(op, Postfix)]
+
+        if prefixes and self.optional(depth):
+            work.append((self.rng.choice(prefixes).op, depth))
+        work.append((table.atom, depth))
+        if postfixes and self.optional(depth):
+            work.append((self.rng.choice(postfixes).op, depth))
+
+        return work
+
+
+def sentence(
+    parser: Parser[str, t.Any, t.Any],
+    seed: int | None = None,
+    knobs: Knobs = Knobs(),
+) -> str:
+    return "".join(_Walker(parser, random.Random(seed), knobs).sentence())
+
+
+def corpus(
+    parser: Parser[str, t.Any, t.Any],
+    size: int,
+    seed: int | None = None,
+    knobs: Knobs = Knobs(),
+    separator: str = "\n",
+    validate: bool = False,
+) -> t.Generator[str, None, None]:
+    walker = _Walker(parser, random.Random(seed), knobs)
+    written = 0
+
+    while written < size:
+        # The last sentence closes early so the corpus ends near `size`.
+        target = min(knobs.sentence_bytes, size - written)
+        if validate:
+            fragments = [_valid_sentence(walker, target)]
+        else:
+            fragments = walker.sentence(target)
+
+        for fragment in fragments:
+            written += _byte_length(fragment)
+            yield fragment
+
+        written += _byte_length(separator)
+        yield separator
+
+
+_VALIDATE_ATTEMPTS: t.Final = 100
+
+
+def _valid_sentence(walker: _Walker, target: int) -> str:
+    for _ in range(_VALIDATE_ATTEMPTS):
+        text = "".join(walker.sentence(target))
+        match walker.parser.parse(Stream.from_source(text)):
+            case PR.Match(_, pos) if pos.position == len(text):
+                return text
+            case _:
+                continue
+
+    raise ValueError(
+        f"No parseable sentence in {_VALIDATE_ATTEMPTS} attempts; "
+        "the grammar likely relies on ordered choice or predicates"
+    )
+
+
+def _byte_length(fragment: str) -> int:
+    if fragment.isascii():
+        return len(fragment)
+    return len(fragment.encode())
@@ -0,0 +1,112 @@
+import typing as t
+
+from combinators import (
+    Alternative,
+    AndCheck,
+    Boolean,
+    Budgeted,
+    Choice,
+    Cursored,
+    Deferred,
+    DelimitedBy,
+    IgnoreThen,
+    Map,
+    OrElse,
+    OrNot,
+    Parser,
+    Recursive,
+    Repeated,
+    Require,
+    SeparatedBy,
+    Seq,
+    Spanned,
+    Then,
+    ThenIgnore,
+    ThenWithContext,
+    To,
+)
+from generalized import Generalized
+from pratt import Precedence
+
+# Traversal helpers shared by the tools that analyse a combinator graph
+# rather than run it.
+
+type AnyParser = Parser[t.Any, t.Any, t.Any]
+
+
+def children(parser: AnyParser) -> list[AnyParser]:
+    match parser:
+        case (
+            Then(first, second)
+            | IgnoreThen(first, second)
+            | ThenIgnore(first, second)
+            | Alternative(first, second)
+        ):
+            return [first, second]
+        case DelimitedBy(inner, start, end):
+            return [start, inner, end]
+        case Choice(choices):
+            return list(choices)
+        case Seq(parsers):
+            return list(parsers)
+        case SeparatedBy(inner, separator):
+            return [inner, separator]
+        case (
+            Map(inner)
+            | To(inner)
+            | Spanned(inner)
+            | AndCheck(inner)
+            | Require(inner)
+            | OrNot(inner)
+            | OrElse(inner)
+            | Boolean(inner)
+            | Repeated(inner)
+            | Deferred(inner)
+            | Budgeted(inner)
+            | Cursored(inner)
+            | Generalized(inner)
+            | ThenWithContext(inner)
+        ):
+            return [inner]
+        case Recursive(inner):
+            return [] if inner is None else [inner]
+        case Precedence(atom, operators):
+            return [atom, *(operator.op for operator in operators)]
+        case _:
+            return []
+
+
+def reachable(root: AnyParser) -> dict[int, AnyParser]:
+    nodes = dict[int, AnyParser]()
+    stack = [root]
+    while stack:
+        parser = stack.pop()
+        if id(parser) not in nodes:
+            nodes[id(parser)] = parser
+            stack.extend(children(parser))
+    return nodes
+
+
+def fixpoint[Value](
+    nodes: dict[int, AnyParser],
+    initial: Value,
+    step: t.Callable[[AnyParser, t.Callable[[AnyParser], Value]], Value],
+) -> dict[int, Value]:
+    # `step` computes a node's value from its children's current values. It
+    # must be monotone, so that repeating it until nothing changes terminates
+    # even when `Recursive` makes the graph cyclic.
+    values = dict.fromkeys(nodes, initial)
+
+    def of(child: AnyParser) -> Value:
+        return values[id(child)]
+
+    changed = True
+    while changed:
+        changed = False
+        for key, parser in nodes.items():
+            value = step(parser, of)
+            if value != values[key]:
+                values[key] = value
+                changed = True
+
+    return values
@@ -0,0 +1,387 @@
+import typing as t
+from dataclasses import dataclass
+from enum import Enum
+
+from combinators import (
+    Alternative,
+    AndCheck,
+    Boolean,
+    Budgeted,
+    Choice,
+    Cursored,
+    Deferred,
+    DelimitedBy,
+    Filter,
+    IgnoreThen,
+    Just,
+    Map,
+    Nothing,
+    OneOf,
+    OrElse,
+    OrNot,
+    Recursive,
+    Repeated,
+    Require,
+    SeparatedBy,
+    Seq,
+    SkipWhile,
+    Spanned,
+    StartsWith,
+    TakeWhile,
+    Then,
+    ThenIgnore,
+    ThenWithContext,
+    To,
+)
+from generalized import Generalized
+from graph import AnyParser
+from pratt import Prefix, Precedence
+import graph
+
+# Static checks over a combinator graph.
+#
+# Two properties are computed for every reachable parser as a least fixpoint:
+# whether it can match without consuming input (nullable) and whether it can
+# never return `NoMatch` (infallible). Both are conservative where the graph
+# is opaque: `ThenWithContext` builds its second parser at parse time, and
+# parsers defined outside this module are only known by their `parse`, so
+# both are assumed to consume input and to be able to fail. `StartsWith` with
+# an empty pattern never matches, as at parse time.
+#
+# `lint` only reports; `Repeated` and `Precedence` also refuse to loop without
+# progress at parse time and raise `NoProgress` instead.
+
+
+class Lint(Enum):
+    InfiniteRepetition = 1
+    UnreachableBranch = 2
+    LeftRecursion = 3
+    SharedPrefix = 4
+
+
+@dataclass(frozen=True)
+class Finding:
+    kind: Lint
+    parser: AnyParser
+    message: str
+
+
+type _Of = t.Callable[[AnyParser], bool]
+
+
+def lint(parser: AnyParser) -> list[Finding]:
+    nodes = graph.reachable(parser)
+    nullable = graph.fixpoint(nodes, False, _nullable)
+    infallible = graph.fixpoint(nodes, False, _infallible)
+
+    # `a | b | c` nests as `(a | b) | c`; only the outermost is checked.
+    nested = {
+        id(node.first_choice)
+        for node in nodes.values()
+        if isinstance(node, Alternative)
+    }
+
+    findings = list[Finding]()
+    for node in nodes.values():
+        findings.extend(_repetition(node, nullable))
+        if id(node) not in nested:
+            findings.extend(_branches(node, infallible))
+        findings.extend(_left_recursion(node, nullable))
+    return findings
+
+
+def _nullable(parser: AnyParser, of: _Of) -> bool:
+    match parser:
+        case Nothing() | OrNot() | OrElse() | Boolean():
+            return True
+        case TakeWhile(_, at_least) | SkipWhile(_, at_least):
+            return at_least == 0
+        case Repeated(inner, at_least):
+            return at_least == 0 or of(inner)
+        case SeparatedBy(inner):
+            return parser._at_least == 0 or of(inner)
+        case Alternative() | Choice():
+            return any(of(child) for child in graph.children(parser))
+        case Recursive(inner):
+            return inner is not None and of(inner)
+        case Precedence(atom):
+            return of(atom)
+        case (
+            Then()
+            | IgnoreThen()
+            | ThenIgnore()
+            | DelimitedBy()
+            | Seq()
+            | Map()
+            | To()
+            | Spanned()
+            | AndCheck()
+            | Require()
+            | Deferred()
+            | Budgeted()
+            | Cursored()
+            | Generalized()
+        ):
+            return all(of(child) for child in graph.children(parser))
+        case _:
+            return False
+
+
+def _infallible(parser: AnyParser, of: _Of) -> bool:
+    match parser:
+        case OrNot() | OrElse() | Boolean() | Require():
+            # `Require` turns a failure into an error, which ends the parse
+            # just as surely as a match would.
+            return True
+        case TakeWhile(_, at_least) | SkipWhile(_, at_least) | Repeated(_, at_least):
+            return at_least == 0
+        case SeparatedBy():
+            return parser._at_least == 0
+        case Alternative() | Choice():
+            return any(of(child) for child in graph.children(parser))
+        case (
+            Then()
+            | IgnoreThen()
+            | ThenIgnore()
+            | DelimitedBy()
+            | Seq()
+            | Map()
+            | To()
+            | Spanned()
+            | Deferred()
+            | Budgeted()
+            | Cursored()
+        ):
+            return all(of(child) for child in graph.children(parser))
+        case Recursive(inner):
+            return inner is not None and of(inner)
+        case Precedence(atom):
+            return of(atom)
+        case _:
+            return False
+
+
+def _repetition(parser: AnyParser, nullable: dict[int, bool]) -> list[Finding]:
+    match parser:
+        case Repeated(inner) if nullable[id(inner)]:
+            return [
+                Finding(
+                    Lint.InfiniteRepetition,
+                    parser,
+                    f"Repeated {type(inner).__name__} can match without "
+                    "consuming input",
+                )
+            ]
+        case SeparatedBy(inner, separator) if (
+            nullable[id(inner)] and nullable[id(separator)]
+        ):
+            return [
+                Finding(
+                    Lint.InfiniteRepetition,
+                    parser,
+                    f"{type(inner).__name__} separated by "
+                    f"{type(separator).__name__} can match without consuming input",
+                )
+            ]
+        case _:
+            return []
+
+
+def _alternatives(parser: AnyParser) -> list[AnyParser]:
+    match parser:
+        case Alternative(first, second):
+            return [*_alternatives(first), second]
+        case _:
+            return [parser]
+
+
+def _branches(parser: AnyParser, infallible: dict[int, bool]) -> list[Finding]:
+    match parser:
+        case Alternative():
+            branches = _alternatives(parser)
+        case Choice(choices):
+            branches = list(choices)
+        case _:
+            return []
+
+    findings = list[Finding]()
+
+    for index, branch in enumerate(branches):
+        for earlier in branches[:index]:
+            if infallible[id(earlier)]:
+                reason = f"{type(earlier).__name__} before it never fails"
+            elif _shadows(earlier, branch):
+                reason = f"{type(earlier).__name__} before it matches its prefix"
+            else:
+                continue
+            findings.append(
+                Finding(
+                    Lint.UnreachableBranch,
+                    parser,
+                    f"Branch {index} ({type(branch).__name__}) is unreachable: "
+                    f"{reason}",
+                )
+            )
+            break
+
+    seen = set[int]()
+    for index, branch in enumerate(branches):
+        spine = [node for node in _left_spine(branch) if not _primitive(node)]
+        shared = next((node for node in spine if id(node) in seen), None)
+        if shared is not None:
+            findings.append(
+                Finding(
+                    Lint.SharedPrefix,
+                    parser,
+                    f"Branch {index} starts with the same {type(shared).__name__} "
+                    "as an earlier branch, which is parsed again on backtracking",
+                )
+            )
+        seen.update(id(node) for node in spine)
+
+    return findings
+
+
+def _shadows(earlier: AnyParser, later: AnyParser) -> bool:
+    # An earlier branch that is exactly a literal matches whenever a later
+    # branch starting with that literal could, so the later one never runs.
+    prefix, exact = _literal(earlier)
+    if not exact:
+        return False
+    literal, _ = _literal(later)
+    return literal[: len(prefix)] == prefix
+
+
+def _literal(parser: AnyParser) -> tuple[tuple[t.Any, ...], bool]:
+    # The items any match must start with, and whether every input starting
+    # with them matches.
+    match parser:
+        case Just(pattern):
+            return (pattern,), True
+        case StartsWith(pattern) if len(pattern) > 0:
+            return tuple(pattern), True
+        case (
+            Then(first, second)
+            | IgnoreThen(first, second)
+            | ThenIgnore(first, second)
+        ):
+            return _literal_chain([first, second])
+        case DelimitedBy(inner, start, end):
+            return _literal_chain([start, inner, end])
+        case Seq(parsers):
+            return _literal_chain(list(parsers))
+        case (
+            Map(inner)
+            | To(inner)
+            | Spanned(inner)
+            | Deferred(inner)
+            | Budgeted(inner)
+            | Cursored(inner)
+        ):
+            return _literal(inner)
+        case _:
+            return (), False
+
+
+def _literal_chain(
+    parsers: list[AnyParser],
+) -> tuple[tuple[t.Any, ...], bool]:
+    prefix = tuple[t.Any, ...]()
+    for parser in parsers:
+        literal, exact = _literal(parser)
+        prefix += literal
+        if not exact:
+            return prefix, False
+    return prefix, True
+
+
+def _left_spine(parser: AnyParser) -> list[AnyParser]:
+    # `parser` and the parsers that start where it does, outermost first.
+    spine = [parser]
+    while True:
+        match parser:
+            case (
+                Then(first)
+                | IgnoreThen(first)
+                | ThenIgnore(first)
+                | Map(first)
+                | To(first)
+                | Spanned(first)
+            ):
+                parser = first
+                spine.append(parser)
+            case Seq((first, *_)):
+                parser = first
+                spine.append(parser)
+            case _:
+                return spine
+
+
+def _primitive(parser: AnyParser) -> bool:
+    # Re-running these costs a single comparison or scan.
+    return isinstance(
+        parser, Just | OneOf | Filter | Nothing | StartsWith | TakeWhile | SkipWhile
+    )
+
+
+def _left_recursion(parser: AnyParser, nullable: dict[int, bool]) -> list[Finding]:
+    if not isinstance(parser, Recursive) or parser._parser is None:
+        return []
+
+    seen = set[int]()
+    stack: list[AnyParser] = [parser._parser]
+    while stack:
+        node = stack.pop()
+        if node is parser:
+            return [
+                Finding(
+                    Lint.LeftRecursion,
+                    parser,
+                    "Recursive parser can reach itself without consuming input",
+                )
+            ]
+        if id(node) not in seen:
+            seen.add(id(node))
+            stack.extend(_left_edges(node, nullable))
+
+    return []
+
+
+def _left_edges(parser: AnyParser, nullable: dict[int, bool]) -> list[AnyParser]:
+    # The parsers that may run at the position `parser` started from.
+    match parser:
+        case (
+            Then(first, second)
+            | IgnoreThen(first, second)
+            | ThenIgnore(first, second)
+        ):
+            return _nullable_prefix([first, second], nullable)
+        case DelimitedBy(inner, start, end):
+            return _nullable_prefix([start, inner, end], nullable)
+        case Seq(parsers):
+            return _nullable_prefix(list(parsers), nullable)
+        case SeparatedBy(inner, separator):
+            if parser._allow_leading:
+                return _nullable_prefix([separator, inner], nullable)
+            return _nullable_prefix([inner, separator], nullable)
+        case ThenWithContext(first):
+            return [first]
+        case Precedence(atom, operators):
+            prefixes = [op.op for op in operators if isinstance(op, Prefix)]
+            return [atom, *prefixes]
+        case Generalized():
+            # The generalized engine accepts left recursion.
+            return []
+        case _:
+            return graph.children(parser)
+
+
+def _nullable_prefix(
+    parsers: list[AnyParser], nullable: dict[int, bool]
+) -> list[AnyParser]:
+    edges = list[AnyParser]()
+    for parser in parsers:
+        edges.append(parser)
+        if not nullable[id(parser)]:
+            break
+    return edges
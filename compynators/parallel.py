@@ -0,0 +1,196 @@
+import typing as t
+from concurrent.futures import Executor, ProcessPoolExecutor
+import functools
+import multiprocessing
+import os
+
+from combinators import Parser, ParseResultType, PR
+from stream import Stream
+
+type SplitAt = str | Parser[str, t.Any, t.Any] | t.Callable[[str, int], int]
+
+type _ChunkResult[Out, Err] = (
+    tuple[list[Out], int] | PR.NoMatchType | PR.Error[Err]
+)
+
+# Resync parsers are tried at each index of a window of this many characters,
+# so finding a boundary never builds a Stream over the whole remaining input.
+_RESYNC_WINDOW: t.Final = 1 << 16
+
+# Set once per worker process by `_init_worker`. The in-process path binds
+# the same values with `functools.partial` instead, so concurrent callers in
+# one process never share these globals.
+_worker_parser: Parser[str, t.Any, t.Any] | None = None
+_worker_source: str = ""
+_worker_file_handle: os.PathLike[str] | None = None
+
+
+def parse_parallel[Out, Err](
+    parser: Parser[str, list[Out], Err],
+    source: str,
+    split_at: SplitAt,
+    workers: int | None = None,
+    file_handle: os.PathLike[str] | None = None,
+    chunks_per_worker: int = 4,
+    start_method: str | None = None,
+) -> ParseResultType[str, list[Out], Err]:
+    workers = workers or os.cpu_count() or 1
+    boundaries = _boundaries(source, split_at, workers * chunks_per_worker)
+    chunks = list(zip(boundaries, boundaries[1:]))
+
+    if workers == 1 or len(chunks) <= 1:
+        parse_chunk = functools.partial(_parse_chunk, parser, source, file_handle)
+        return _collect(parser, map(parse_chunk, chunks), chunks, source, file_handle)
+
+    executor = _executor(workers, parser, source, file_handle, start_method)
+    try:
+        futures = [executor.submit(_parse_worker_chunk, chunk) for chunk in chunks]
+        results = (future.result() for future in futures)
+        return _collect(parser, results, chunks, source, file_handle)
+    finally:
+        # Chunks after an error or a re-parsed tail are not needed; do not wait
+        # for the ones that have not started.
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _executor(
+    workers: int,
+    parser: Parser[str, t.Any, t.Any],
+    source: str,
+    file_handle: os.PathLike[str] | None,
+    start_method: str | None,
+) -> Executor:
+    # Workers are started the platform's default way, which sends them the
+    # parser and source by pickling, so the grammar must not hold lambdas or
+    # closures. `start_method="fork"` lets workers inherit them instead where
+    # fork is available; it is not safe on macOS or in a parent that already
+    # runs other threads.
+    context = multiprocessing.get_context(start_method)
+
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=_init_worker,
+        initargs=(parser, source, file_handle),
+    )
+
+
+def _init_worker(
+    parser: Parser[str, t.Any, t.Any],
+    source: str,
+    file_handle: os.PathLike[str] | None,
+) -> None:
+    global _worker_parser, _worker_source, _worker_file_handle
+    _worker_parser = parser
+    _worker_source = source
+    _worker_file_handle = file_handle
+
+
+def _parse_worker_chunk(bounds: tuple[int, int]) -> _ChunkResult[t.Any, t.Any]:
+    assert _worker_parser is not None, "Worker used before initialization"
+    return _parse_chunk(_worker_parser, _worker_source, _worker_file_handle, bounds)
+
+
+def _parse_chunk(
+    parser: Parser[str, t.Any, t.Any],
+    source: str,
+    file_handle: os.PathLike[str] | None,
+    bounds: tuple[int, int],
+) -> _ChunkResult[t.Any, t.Any]:
+    start, end = bounds
+    chunk = Stream.from_source(source[start:end], file_handle, span_base=start)
+
+    match parser.parse(chunk):
+        case PR.Match(items, pos):
+            return items, pos.position
+        case PR.NoMatch:
+            return PR.NoMatch
+        case PR.Error() as error:
+            return error
+
+
+def _collect[Out, Err](
+    parser: Parser[str, list[Out], Err],
+    results: t.Iterable[_ChunkResult[Out, Err]],
+    chunks: list[tuple[int, int]],
+    source: str,
+    file_handle: os.PathLike[str] | None,
+) -> ParseResultType[str, list[Out], Err]:
+    # Chunk results can only be concatenated while each chunk is consumed
+    # completely. From the first chunk that stops short or does not match,
+    # the rest of the source is parsed sequentially instead, so the result is
+    # the one a sequential parse of the whole source would have produced;
+    # later chunk results are discarded.
+    items = list[Out]()
+
+    for (start, end), result in zip(chunks, results):
+        match result:
+            case (chunk_items, consumed) if start + consumed == end:
+                items.extend(chunk_items)
+            case PR.Error() as error:
+                return error
+            case _:
+                return _parse_tail(parser, items, source, file_handle, start)
+
+    return PR.Match(items, Stream.from_source(source, file_handle).advance(len(source)))
+
+
+def _parse_tail[Out, Err](
+    parser: Parser[str, list[Out], Err],
+    items: list[Out],
+    source: str,
+    file_handle: os.PathLike[str] | None,
+    start: int,
+) -> ParseResultType[str, list[Out], Err]:
+    tail = Stream.from_source(source, file_handle).advance(start)
+    match parser.parse(tail):
+        case PR.Match(tail_items, pos):
+            return PR.Match(items + tail_items, pos)
+        case no_match_or_err:
+            return no_match_or_err
+
+
+def _boundaries(source: str, split_at: SplitAt, count: int) -> list[int]:
+    boundaries = [0]
+    step = max(len(source) // max(count, 1), 1)
+
+    target = step
+    while target < len(source):
+        boundary = _next_boundary(source, max(target, boundaries[-1]), split_at)
+        if boundary >= len(source):
+            break
+        if boundary > boundaries[-1]:
+            boundaries.append(boundary)
+        target = boundary + step
+
+    boundaries.append(len(source))
+    return boundaries
+
+
+def _next_boundary(source: str, index: int, split_at: SplitAt) -> int:
+    match split_at:
+        case str(delimiter):
+            found = source.find(delimiter, index)
+            if found == -1:
+                return len(source)
+            return found + len(delimiter)
+        case Parser() as resync:
+            return _resync(source, index, resync)
+        case func:
+            return func(source, index)
+
+
+def _resync(source: str, index: int, resync: Parser[str, t.Any, t.Any]) -> int:
+    while index < len(source):
+        window = Stream.from_source(
+            source[index : index + _RESYNC_WINDOW], span_base=index
+        )
+        for position in range(len(window)):
+            match resync.parse(window.advance(position)):
+                case PR.Match(_, pos) if pos.position > position:
+                    return index + pos.position
+                case _:
+                    continue
+        index += _RESYNC_WINDOW
+
+    return len(source)
@@ -0,0 +1,205 @@
+import typing as t
+from dataclasses import dataclass, field
+from enum import Enum
+
+from combinators import Just, Parser, ParseResultType, PR, NoProgress
+from stream import Stream
+from union import Maybe
+import deferred
+
+# Operator-precedence (Pratt) parsing.
+#
+# A precedence table is a flat list of prefix, infix and postfix operators with
+# binding powers; higher powers bind tighter. The whole table is handled by a
+# single loop, so parsing an atom costs the same number of calls whether the
+# table has one level or twenty. Operators written as `Just(token)` are looked
+# up by the next item in a dict instead of being tried one after another;
+# candidates are still tried in table order.
+
+
+class Assoc(Enum):
+    Left = 1
+    Right = 2
+
+
+@dataclass(frozen=True)
+class Prefix[In, Op, Out, Err]:
+    op: Parser[In, Op, Err]
+    power: int
+    build: t.Callable[[Op, Out], Out]
+
+
+@dataclass(frozen=True)
+class Infix[In, Op, Out, Err]:
+    op: Parser[In, Op, Err]
+    power: int
+    build: t.Callable[[Out, Op, Out], Out]
+    assoc: Assoc = Assoc.Left
+
+
+@dataclass(frozen=True)
+class Postfix[In, Op, Out, Err]:
+    op: Parser[In, Op, Err]
+    power: int
+    build: t.Callable[[Out, Op], Out]
+
+
+type Operator[In, Out, Err] = (
+    Prefix[In, t.Any, Out, Err]
+    | Infix[In, t.Any, Out, Err]
+    | Postfix[In, t.Any, Out, Err]
+)
+
+
+@dataclass
+class _Dispatch[In, Entry]:
+    by_item: dict[t.Any, list[Entry]] = field(default_factory=dict)
+    others: list[Entry] = field(default_factory=list)
+    # Table index of every entry, by `id`.
+    order: dict[int, int] = field(default_factory=dict)
+
+    def add(self, op: Parser[In, t.Any, t.Any], entry: Entry) -> None:
+        self.order[id(entry)] = len(self.order)
+        if isinstance(op, Just):
+            try:
+                self.by_item.setdefault(op.pattern, []).append(entry)
+                return
+            except TypeError:
+                pass
+        self.others.append(entry)
+
+    def candidates(self, input: Stream[In]) -> t.Iterable[Entry]:
+        match input.peek_item():
+            case Maybe.Some(item):
+                try:
+                    keyed = self.by_item.get(item, ())
+                except TypeError:
+                    keyed = ()
+            case Maybe.Nil:
+                keyed = ()
+
+        if not self.others:
+            return keyed
+        if not keyed:
+            return self.others
+        order = self.order
+        return sorted([*keyed, *self.others], key=lambda entry: order[id(entry)])
+
+
+def _apply(build: t.Callable[..., t.Any], *args: t.Any) -> t.Any:
+    if deferred.is_deferring():
+        return deferred.delay(build, *args)
+    return build(*args)
+
+
+@dataclass(frozen=True)
+class Precedence[In, Out, Err](Parser[In, Out, Err]):
+    atom: Parser[In, Out, Err]
+    operators: t.Sequence[Operator[In, Out, Err]]
+    _prefix: _Dispatch[In, Prefix[In, t.Any, Out, Err]] = field(
+        init=False, repr=False, compare=False
+    )
+    _suffix: _Dispatch[
+        In, Infix[In, t.Any, Out, Err] | Postfix[In, t.Any, Out, Err]
+    ] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "operators", tuple(self.operators))
+
+        prefix = _Dispatch[In, Prefix[In, t.Any, Out, Err]]()
+        suffix = _Dispatch[
+            In, Infix[In, t.Any, Out, Err] | Postfix[In, t.Any, Out, Err]
+        ]()
+
+        for operator in self.operators:
+            match operator:
+                case Prefix(op):
+                    prefix.add(op, operator)
+                case Infix(op) | Postfix(op):
+                    suffix.add(op, operator)
+
+        object.__setattr__(self, "_prefix", prefix)
+        object.__setattr__(self, "_suffix", suffix)
+
+    @t.override
+    def parse(self, input: Stream[In]) -> ParseResultType[In, Out, Err]:
+        return self._expression(input, 0)
+
+    def _expression(
+        self, input: Stream[In], min_power: int
+    ) -> ParseResultType[In, Out, Err]:
+        match self._operand(input):
+            case PR.Match(lhs, pos):
+                ...
+            case no_match_or_err:
+                return no_match_or_err
+
+        while True:
+            for operator in self._suffix.candidates(pos):
+                if operator.power < min_power:
+                    continue
+
+                mark = pos.mark()
+                match operator.op.parse(pos):
+                    case PR.Match(op_item, after_op):
+                        ...
+                    case PR.NoMatch:
+                        pos.rewind(mark)
+                        continue
+                    case PR.Error() as err:
+                        return err
+
+                if isinstance(operator, Postfix):
+                    if after_op.position == mark:
+                        raise NoProgress(after_op.span_of(1))
+                    lhs = _apply(operator.build, lhs, op_item)
+                    pos = after_op
+                    break
+
+                rhs_power = operator.power
+                if operator.assoc is Assoc.Left:
+                    rhs_power += 1
+
+                match self._expression(after_op, rhs_power):
+                    case PR.Match(rhs, after_rhs):
+                        if after_rhs.position == mark:
+                            raise NoProgress(after_rhs.span_of(1))
+                        lhs = _apply(operator.build, lhs, op_item, rhs)
+                        pos = after_rhs
+                        break
+                    case PR.NoMatch:
+                        pos.rewind(mark)
+                        continue
+                    case PR.Error() as err:
+                        return err
+            else:
+                return PR.Match(lhs, pos)
+
+    def _operand(self, input: Stream[In]) -> ParseResultType[In, Out, Err]:
+        mark = input.mark()
+        for operator in self._prefix.candidates(input):
+            match operator.op.parse(input):
+                case PR.Match(op_item, after_op):
+                    ...
+                case PR.NoMatch:
+                    input.rewind(mark)
+                    continue
+                case PR.Error() as err:
+                    return err
+
+            match self._expression(after_op, operator.power):
+                case PR.Match(operand, pos):
+                    return PR.Match(_apply(operator.build, op_item, operand), pos)
+                case PR.NoMatch:
+                    input.rewind(mark)
+                    continue
+                case PR.Error() as err:
+                    return err
+
+        return self.atom.parse(input)
+
+
+def precedence[In, Out, Err](
+    atom: Parser[In, Out, Err], operators: t.Sequence[Operator[In, Out, Err]]
+) -> Precedence[In, Out, Err]:
+    return Precedence(atom, operators)
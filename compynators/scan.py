@@ -0,0 +1,132 @@
+import typing as t
+import array
+import functools
+import re
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is an optional extra
+    np = None
+
+
+type CharClass[Item] = t.Collection[Item] | t.Callable[[Item], bool]
+
+# Bulk scans over buffers look at geometrically growing windows so that short
+# runs near the start of a very large buffer stay cheap.
+_FIRST_WINDOW: t.Final = 64
+_MAX_WINDOW: t.Final = 1 << 20
+
+_BUFFER_TYPES: t.Final = (bytes, bytearray, memoryview, array.array)
+
+
+def run_length[Item](
+    source: t.Sequence[Item], start: int, char_class: CharClass[Item]
+) -> int:
+    if start >= len(source):
+        return 0
+
+    if callable(char_class):
+        return _run_length_predicate(source, start, char_class)
+
+    if isinstance(source, str):
+        chars = t.cast(t.Collection[str], char_class)
+        return _run_length_str(source, start, frozenset(chars))
+
+    if np is not None and (
+        isinstance(source, _BUFFER_TYPES) or isinstance(source, np.ndarray)
+    ):
+        length = _run_length_numpy(source, start, char_class)
+        if length is not None:
+            return length
+
+    members = frozenset(char_class)
+    return _run_length_predicate(source, start, members.__contains__)
+
+
+def _run_length_predicate[Item](
+    source: t.Sequence[Item], start: int, predicate: t.Callable[[Item], bool]
+) -> int:
+    # Indexing rather than `islice`, which would walk past the first `start`
+    # items on every call.
+    end = start
+    while end < len(source) and predicate(source[end]):
+        end += 1
+    return end - start
+
+
+@functools.lru_cache(maxsize=256)
+def _char_class_pattern(chars: frozenset[str]) -> re.Pattern[str]:
+    if not all(isinstance(char, str) and len(char) == 1 for char in chars):
+        raise ValueError("char classes over str streams must be single characters")
+    if not chars:
+        return re.compile("")
+    return re.compile("[" + "".join(re.escape(char) for char in sorted(chars)) + "]*")
+
+
+def _run_length_str(source: str, start: int, chars: frozenset[str]) -> int:
+    match = _char_class_pattern(chars).match(source, start)
+    assert match is not None, "A starred char class always matches"
+    return match.end() - start
+
+
+def _integer_members(
+    char_class: t.Collection[t.Any], low: int, high: int
+) -> list[int]:
+    # The members an item in `[low, high]` can compare equal to. Anything else
+    # (`" "` against a byte, `200` against a signed byte) never matches, so it
+    # is dropped rather than handed to numpy, which would reject it.
+    members = list[int]()
+    for member in char_class:
+        try:
+            value = int(member)
+        except (TypeError, ValueError, OverflowError):
+            continue
+        if value == member and low <= value <= high:
+            members.append(value)
+    return members
+
+
+def _run_length_numpy(
+    source: t.Any, start: int, char_class: t.Collection[t.Any]
+) -> int | None:
+    # `None` when the buffer does not hold integers; the caller then falls
+    # back to comparing items one by one.
+    assert np is not None
+
+    if not isinstance(source, np.ndarray):
+        source = memoryview(source)
+    view = np.asarray(source)
+    if view.dtype.kind not in "iu":
+        return None
+    view = view[start:]
+
+    if view.dtype == np.uint8:
+        table = np.zeros(256, dtype=np.bool_)
+        table[_integer_members(char_class, 0, 255)] = True
+
+        def in_class(window: t.Any) -> t.Any:
+            return table[window]
+
+    else:
+        limits = np.iinfo(view.dtype)
+        members = np.array(
+            _integer_members(char_class, int(limits.min), int(limits.max)),
+            dtype=view.dtype,
+        )
+        isin = np.isin
+
+        def in_class(window: t.Any) -> t.Any:
+            return isin(window, members)
+
+    offset = 0
+    width = _FIRST_WINDOW
+    while offset < len(view):
+        mask = in_class(view[offset : offset + width])
+        # argmin finds the first False; an all-True window means the run continues.
+        first_miss = int(np.argmin(mask))
+        if not mask[first_miss]:
+            return offset + first_miss
+        offset += len(mask)
+        width = min(width * 4, _MAX_WINDOW)
+
+    return offset
@@ -1,9 +1,11 @@
 import typing as t
 from dataclasses import dataclass
+import array
 import os
 
 from union import Maybe, MaybeType
 from span import Spanned, Span
+import scan
 
 
 @dataclass
@@ -17,17 +19,103 @@ class Source:
         return lines[index]
 
 
-@dataclass
+# Streams over contiguous text or buffers use `range`s, which cost the same
+# whatever the length; token streams store their offsets in `array('q')`.
+type Offsets = range | array.array[int]
+
+
+def _offsets(values: t.Iterable[int]) -> array.array[int]:
+    return array.array("q", values)
+
+
+def _columns[Item](
+    spans: t.Iterable[Spanned[Item]],
+) -> tuple[list[Item], array.array[int], array.array[int]]:
+    items = list[Item]()
+    starts = _offsets(())
+    ends = _offsets(())
+
+    for spanned in spans:
+        items.append(spanned.item)
+        starts.append(spanned.span.start)
+        ends.append(spanned.span.end)
+
+    return items, starts, ends
+
+
+# Read-only `Spanned` view over the columns, for code written against the
+# former `Stream.spans` list. Values are built per access.
+class _SpansView[ItemType](t.Sequence[Spanned[ItemType]]):
+    def __init__(self, stream: "Stream[ItemType]") -> None:
+        self._stream = stream
+
+    def __len__(self) -> int:
+        return len(self._stream.items)
+
+    @t.overload
+    def __getitem__(self, index: int) -> Spanned[ItemType]: ...
+
+    @t.overload
+    def __getitem__(self, index: slice) -> list[Spanned[ItemType]]: ...
+
+    def __getitem__(
+        self, index: int | slice
+    ) -> Spanned[ItemType] | list[Spanned[ItemType]]:
+        stream = self._stream
+        if isinstance(index, slice):
+            return [
+                Spanned(item, Span(start, end))
+                for item, start, end in zip(
+                    stream.items[index], stream.starts[index], stream.ends[index]
+                )
+            ]
+        return Spanned(stream.items[index], stream.span_at(index))
+
+
+# Items and spans are stored column-wise: one sequence of items plus parallel
+# start / end offset arrays. `Spanned` values are only built on demand, and
+# `map` swaps the item column while sharing the offset columns.
+#
+# `Stream(file_handle, spans, position)` still builds a stream from a list of
+# `Spanned` tokens, as before the columnar layout, and `spans` reads them back.
+@dataclass(init=False)
 class Stream[ItemType]:
     file_handle: os.PathLike[str] | None  # TODO: Not a handle
-    spans: list[Spanned[ItemType]]
+    items: t.Sequence[ItemType]
+    starts: Offsets
+    ends: Offsets
     position: int = 0
 
+    def __init__(
+        self,
+        file_handle: os.PathLike[str] | None,
+        spans: t.Iterable[Spanned[ItemType]] | None = None,
+        position: int = 0,
+        *,
+        items: t.Sequence[ItemType] | None = None,
+        starts: Offsets | None = None,
+        ends: Offsets | None = None,
+    ) -> None:
+        if spans is not None:
+            assert items is None, "Pass either spans or items, not both"
+            items, starts, ends = _columns(spans)
+        assert items is not None and starts is not None and ends is not None
+        self.file_handle = file_handle
+        self.items = items
+        self.starts = starts
+        self.ends = ends
+        self.position = position
+
+    @property
+    def spans(self) -> t.Sequence[Spanned[ItemType]]:
+        return _SpansView(self)
+
     def __iter__(self) -> t.Generator[Spanned[ItemType], None, None]:
-        yield from self.spans
+        for item, start, end in zip(self.items, self.starts, self.ends):
+            yield Spanned(item, Span(start, end))
 
     def __len__(self) -> int:
-        return len(self.spans)
+        return len(self.items)
 
     @staticmethod
     def from_source(
@@ -35,55 +123,134 @@ class Stream[ItemType]:
     ) -> "Stream[str]":
         return Stream(
             file_handle=file_handle,
-            spans=[
-                Spanned(item, Span(idx, idx + 1))
-                for idx, item in enumerate(source, start=span_base)
-            ],
+            items=source,
+            starts=range(span_base, span_base + len(source)),
+            ends=range(span_base + 1, span_base + len(source) + 1),
+        )
+
+    @staticmethod
+    def from_buffer(
+        buffer: bytes | bytearray | array.array[int],
+        file_handle: os.PathLike[str] | None = None,
+        span_base: int = 0,
+    ) -> "Stream[int]":
+        return Stream(
+            file_handle=file_handle,
+            items=buffer,
+            starts=range(span_base, span_base + len(buffer)),
+            ends=range(span_base + 1, span_base + len(buffer) + 1),
         )
 
+    @staticmethod
+    def from_spans[Item](
+        spans: t.Iterable[Spanned[Item]],
+        file_handle: os.PathLike[str] | None = None,
+    ) -> "Stream[Item]":
+        return Stream(file_handle, spans)
+
     def map[NewItemType](
         self, mapper: t.Callable[[ItemType], NewItemType]
     ) -> "Stream[NewItemType]":
         return Stream(
             file_handle=self.file_handle,
-            spans=[
-                Spanned(mapper(spanned.item), spanned.span) for spanned in self.spans
-            ],
+            items=[mapper(item) for item in self.items],
+            starts=self.starts,
+            ends=self.ends,
         )
 
+    def span_at(self, index: int) -> Span:
+        return Span(self.starts[index], self.ends[index])
+
     def remaining(self) -> list[Spanned[ItemType]]:
-        return self.spans[self.position :]
+        start = self.position
+        return [
+            Spanned(item, Span(item_start, item_end))
+            for item, item_start, item_end in zip(
+                self.items[start:], self.starts[start:], self.ends[start:]
+            )
+        ]
 
     def peek(self) -> MaybeType[Spanned[ItemType]]:
-        try:
-            span = self.spans[self.position]
-        except IndexError:
+        if self.position >= len(self.items):
             return Maybe.Nil
-        else:
-            return Maybe.Some(span)
+        return Maybe.Some(
+            Spanned(self.items[self.position], self.span_at(self.position))
+        )
+
+    def peek_item(self) -> MaybeType[ItemType]:
+        if self.position >= len(self.items):
+            return Maybe.Nil
+        return Maybe.Some(self.items[self.position])
 
     def advance(self, by: int = 1) -> t.Self:
         return self.__class__(
             file_handle=self.file_handle,
-            spans=self.spans,
-            position=min(self.position + by, len(self.spans)),
+            items=self.items,
+            starts=self.starts,
+            ends=self.ends,
+            position=min(self.position + by, len(self.items)),
         )
 
+    def mark(self) -> int:
+        return self.position
+
+    def rewind(self, mark: int) -> None:
+        # A plain Stream is never moved by a failed parse, so this only has an
+        # effect on a `Cursor`. Kept unconditional so callers need no checks.
+        self.position = mark
+
+    def run_length(self, char_class: scan.CharClass[ItemType]) -> int:
+        return scan.run_length(self.items, self.position, char_class)
+
+    def slice(self, length: int) -> t.Sequence[ItemType]:
+        return self.items[self.position : self.position + length]
+
+    def span_of(self, length: int) -> Span:
+        if length > 0 and self.position < len(self.items):
+            last = min(self.position + length, len(self.items)) - 1
+            return Span(self.starts[self.position], self.ends[last])
+        if self.position < len(self.items):
+            start = self.starts[self.position]
+            return Span(start, start)
+        if self.items:
+            end = self.ends[-1]
+            return Span(end, end)
+        return Span(0, 0)
+
     def startswith(self, pattern: t.Sequence[ItemType]) -> bool:
         if len(pattern) == 0:
             return False
-        if len(self.spans) < len(pattern):
+        if len(self.items) - self.position < len(pattern):
             return False
 
-        subslice = self.spans[self.position :]
-        if len(subslice) == 0:
-            return False
-
-        for pat, spanned in zip(pattern, subslice):
-            if spanned.item != pat:
+        subslice = self.items[self.position : self.position + len(pattern)]
+        for pat, item in zip(pattern, subslice):
+            if item != pat:
                 return False
 
         return True
 
     def end(self) -> Span:
-        return self.spans[-1].span
+        return self.span_at(-1)
+
+
+# A Stream that parsers advance in place. `advance` moves this object and
+# returns it instead of allocating a new Stream per item, so every combinator
+# that retries from an earlier position takes a `mark` first and `rewind`s to
+# it after a failed attempt. Only `Cursored` hands one out; results that leave
+# it are rebuilt as ordinary Streams.
+class Cursor[ItemType](Stream[ItemType]):
+    @staticmethod
+    def at[Item](stream: Stream[Item]) -> "Cursor[Item]":
+        return Cursor(
+            file_handle=stream.file_handle,
+            items=stream.items,
+            starts=stream.starts,
+            ends=stream.ends,
+            position=stream.position,
+        )
+
+    @t.override
+    def advance(self, by: int = 1) -> t.Self:
+        self.position = min(self.position + by, len(self.items))
+        return self
@@ -0,0 +1,20 @@
+import typing as t
+
+import pytest
+
+from .timing import Bench
+
+# Benchmarks are deselected by default; run them with `pytest -m bench -s`.
+# Each benchmark times its variants on the same input, prints the best of a
+# few repeats, and asserts only the ordering that motivated the feature.
+
+
+@pytest.fixture
+def bench(request: pytest.FixtureRequest) -> t.Generator[Bench, None, None]:
+    bench = Bench()
+    yield bench
+
+    width = max(map(len, bench.results), default=0)
+    print(f"\n{request.node.name}")
+    for label, seconds in bench.results.items():
+        print(f"  {label:<{width}}  {seconds * 1e3:10.3f} ms")
@@ -0,0 +1,27 @@
+import pytest
+
+from budget import Budget
+from combinators import Just, choice
+from stream import Stream
+
+from .timing import Bench
+
+pytestmark = pytest.mark.bench
+
+
+def test_budget_overhead(bench: Bench) -> None:
+    parser = choice([Just("x"), Just("y"), Just("a")]).repeated()
+    stream = Stream.from_source("a" * 20_000)
+    generous = Budget(max_steps=10**9, max_backtracks=10**9, timeout=3600.0)
+
+    plain = bench.time("no budget", lambda: parser.parse(stream))
+    metered = bench.time(
+        "budgeted", lambda: parser.budgeted(generous).parse(stream)
+    )
+    nested = bench.time(
+        "budgeted twice",
+        lambda: parser.budgeted(generous).budgeted(generous).parse(stream),
+    )
+
+    assert metered < plain * 1.5
+    assert nested < plain * 1.75
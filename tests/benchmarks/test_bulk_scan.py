@@ -0,0 +1,41 @@
+import pytest
+
+from combinators import filter, skip_while
+from stream import Stream
+
+from .timing import Bench
+
+pytestmark = pytest.mark.bench
+
+MEGABYTE = 1 << 20
+
+
+def test_megabyte_whitespace_run(bench: Bench) -> None:
+    stream = Stream.from_source(" " * MEGABYTE + "x")
+
+    single = bench.time(
+        "filter(...).repeated()",
+        lambda: filter(str.isspace).repeated().parse(stream),
+        repeat=1,
+    )
+    bulk = bench.time("skip_while(' ')", lambda: skip_while(" ").parse(stream))
+    predicate = bench.time(
+        "skip_while(str.isspace)", lambda: skip_while(str.isspace).parse(stream)
+    )
+
+    assert bulk * 10 < single
+    assert predicate < single
+
+
+def test_megabyte_byte_run(bench: Bench) -> None:
+    pytest.importorskip("numpy")
+    stream = Stream.from_buffer(b"\x00" * MEGABYTE + b"\x01")
+
+    single = bench.time(
+        "filter(...).repeated()",
+        lambda: filter(lambda byte: byte == 0).repeated().parse(stream),
+        repeat=1,
+    )
+    bulk = bench.time("skip_while({0})", lambda: skip_while({0}).parse(stream))
+
+    assert bulk * 10 < single
@@ -0,0 +1,52 @@
+import pytest
+
+from combinators import Just, Recursive, choice, one_of, recursive
+from generalized import generalized
+from stream import Stream
+
+from .timing import Bench
+
+pytestmark = pytest.mark.bench
+
+NUM = one_of("0123456789")
+
+
+def test_exponential_backtracking(bench: Bench) -> None:
+    # Every level tries `term` three times, so backtracking is 3^depth.
+    expr = Recursive[str, object, object]()
+    term = expr.delimited_by(Just("("), Just(")")) | NUM
+    expr.define(
+        choice(
+            [
+                term.then_ignore(Just("+")).then(expr),
+                term.then_ignore(Just("-")).then(expr),
+                term,
+            ]
+        )
+    )
+    engine = generalized(expr)
+
+    for depth in (6, 8, 10):
+        stream = Stream.from_source("(" * depth + "1" + ")" * depth + "+2")
+        backtracking = bench.time(
+            f"backtracking depth={depth}", lambda: expr.parse(stream), repeat=3
+        )
+        earley = bench.time(
+            f"generalized depth={depth}", lambda: engine.parse(stream), repeat=3
+        )
+        assert engine.parse(stream).item == expr.parse(stream).item
+
+    assert earley * 10 < backtracking
+
+
+def test_ambiguous_sum(bench: Bench) -> None:
+    # `e = e + e | num` has Catalan-many derivations and is left recursive,
+    # so only the generalized engine can run it at all.
+    expr = recursive(
+        lambda expr: expr.then_ignore(Just("+")).then(expr) | NUM
+    )
+    engine = generalized(expr)
+
+    for terms in (10, 20, 40):
+        stream = Stream.from_source("+".join("1" * terms))
+        bench.time(f"generalized terms={terms}", lambda: engine.parse(stream))
@@ -0,0 +1,44 @@
+import os
+import typing as t
+
+import pytest
+
+from combinators import Just, take_while
+from parallel import parse_parallel
+from span import Spanned
+from stream import Stream
+
+from .timing import Bench
+
+pytestmark = pytest.mark.bench
+
+
+# A module-level function, so the grammar pickles for spawned workers.
+def _number(run: Spanned[t.Sequence[str]]) -> int:
+    return int(t.cast(str, run.item))
+
+
+LINES = (
+    take_while("0123456789").at_least(1).map(_number)
+    .then_ignore(Just("\n"))
+    .repeated()
+)
+
+
+def test_scaling_with_workers(bench: Bench) -> None:
+    source = "".join(f"{number}\n" for number in range(400_000))
+    cpus = os.cpu_count() or 1
+
+    sequential = bench.time(
+        "sequential", lambda: LINES.parse(Stream.from_source(source)), repeat=3
+    )
+    for workers in sorted({1, 2, 4, cpus}):
+        seconds = bench.time(
+            f"workers={workers}",
+            lambda: parse_parallel(LINES, source, "\n", workers=workers),
+            repeat=3,
+        )
+        if workers > 1 and cpus >= workers:
+            # Chunk results are pickled back to the parent, so expect well
+            # short of linear, but a real gain.
+            assert seconds < sequential / (workers * 0.5)
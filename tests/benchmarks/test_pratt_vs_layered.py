@@ -0,0 +1,79 @@
+import random
+import typing as t
+
+import pytest
+
+from combinators import Just, Parser, Recursive, one_of
+from pratt import Infix, precedence
+from stream import Stream
+
+from .timing import Bench
+
+pytestmark = pytest.mark.bench
+
+# Twelve binary operator levels, loosest first.
+LEVELS = ["|", "^", "&", "=", "<", "~", "+", "-", "*", "/", "%", "@"]
+NUM = one_of("0123456789").map(int)
+
+
+def _build(first: t.Any, op: str, second: t.Any) -> t.Any:
+    return op, first, second
+
+
+def _layered() -> Parser[str, t.Any, t.Any]:
+    expr = Recursive[str, t.Any, t.Any]()
+    level: Parser[str, t.Any, t.Any] = expr.delimited_by(Just("("), Just(")")) | NUM
+    for op in reversed(LEVELS):
+        level = level.then(Just(op).then(level).repeated()).map(_fold)
+    expr.define(level)
+    return expr
+
+
+def _fold(first_rest: tuple[t.Any, list[tuple[str, t.Any]]]) -> t.Any:
+    first, rest = first_rest
+    for op, operand in rest:
+        first = (op, first, operand)
+    return first
+
+
+def _pratt() -> Parser[str, t.Any, t.Any]:
+    expr = Recursive[str, t.Any, t.Any]()
+    atom = expr.delimited_by(Just("("), Just(")")) | NUM
+    table = [Infix(Just(op), power, _build) for power, op in enumerate(LEVELS)]
+    expr.define(precedence(atom, table))
+    return expr
+
+
+def _source(terms: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    parts = [str(rng.randrange(10))]
+    for _ in range(terms - 1):
+        parts.append(rng.choice(LEVELS))
+        parts.append(str(rng.randrange(10)))
+    return "".join(parts)
+
+
+def test_twelve_levels(bench: Bench) -> None:
+    layered = _layered()
+    pratt = _pratt()
+    stream = Stream.from_source(_source(5_000))
+
+    assert layered.parse(stream).item == pratt.parse(stream).item
+
+    slow = bench.time("layered", lambda: layered.parse(stream), repeat=3)
+    fast = bench.time("precedence", lambda: pratt.parse(stream), repeat=3)
+    bench.time("precedence, cursored", lambda: pratt.cursored().parse(stream), repeat=3)
+
+    assert fast * 2 < slow
+
+
+def test_atoms_only(bench: Bench) -> None:
+    # A single atom still walks every layer of the layered form.
+    layered = _layered()
+    pratt = _pratt()
+    stream = Stream.from_source("7")
+
+    slow = bench.time("layered", lambda: layered.parse(stream), number=2_000)
+    fast = bench.time("precedence", lambda: pratt.parse(stream), number=2_000)
+
+    assert fast * 2 < slow
@@ -0,0 +1,54 @@
+from dataclasses import dataclass
+
+import pytest
+
+from combinators import Just, ignore, seq, skip_while, take_while
+from stream import Stream
+
+from .timing import Bench
+
+pytestmark = pytest.mark.bench
+
+WS = skip_while(" ")
+NAME = take_while("abcdefghijklmnopqrstuvwxyz").at_least(1).map(lambda run: run.item)
+NUMBER = take_while("0123456789").at_least(1).map(lambda run: int(run.item))
+
+
+@dataclass(frozen=True)
+class Let:
+    name: str
+    kind: str
+    value: int
+
+
+# `let name : kind = value ;`, the shape of a typical statement rule.
+CHAINED = (
+    Just("l").then(Just("e")).then(Just("t")).then(WS)
+    .ignore_then(NAME).then_ignore(WS).then_ignore(Just(":")).then_ignore(WS)
+    .then(NAME).then_ignore(WS).then_ignore(Just("=")).then_ignore(WS)
+    .then(NUMBER).then_ignore(WS).then_ignore(Just(";")).then_ignore(WS)
+    .map(lambda parts: Let(parts[0][0], parts[0][1], parts[1]))
+    .repeated()
+)
+FLAT = seq(
+    ignore(Just("l")), ignore(Just("e")), ignore(Just("t")), ignore(WS),
+    NAME, ignore(WS), ignore(Just(":")), ignore(WS),
+    NAME, ignore(WS), ignore(Just("=")), ignore(WS),
+    NUMBER, ignore(WS), ignore(Just(";")), ignore(WS),
+    into=Let,
+).repeated()
+
+
+def test_seq_against_chained(bench: Bench) -> None:
+    source = "".join(f"let v{'x' * (n % 7)} : int = {n} ; " for n in range(20_000))
+    chained = CHAINED.parse(Stream.from_source(source)).unwrap()[0]
+    flat = FLAT.parse(Stream.from_source(source)).unwrap()[0]
+    assert flat == chained and len(flat) == 20_000
+
+    chained_seconds = bench.time(
+        "chained then", lambda: CHAINED.parse(Stream.from_source(source)), repeat=3
+    )
+    flat_seconds = bench.time(
+        "seq", lambda: FLAT.parse(Stream.from_source(source)), repeat=3
+    )
+    assert flat_seconds < chained_seconds
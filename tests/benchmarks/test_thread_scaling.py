@@ -0,0 +1,38 @@
+import os
+import sys
+import typing as t
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from combinators import Just, Recursive, take_while
+from stream import Stream
+
+from .timing import Bench
+
+pytestmark = pytest.mark.bench
+
+NUMBER = take_while("0123456789").at_least(1).map(lambda run: int(run.item))
+VALUE = Recursive[str, t.Any, t.Any]()
+VALUE.define(
+    VALUE.separated_by(Just(",")).delimited_by(Just("["), Just("]")) | NUMBER
+)
+
+
+def test_scaling_with_threads(bench: Bench) -> None:
+    # One grammar shared by every thread; each task parses its own document.
+    sources = ["[" + ",".join(f"[{n},{n + 1}]" for n in range(1_000)) + "]"] * 16
+    cpus = os.cpu_count() or 1
+    free_threaded = not getattr(sys, "_is_gil_enabled", lambda: True)()
+
+    def run(threads: int) -> None:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(lambda s: VALUE.parse(Stream.from_source(s)), sources))
+
+    single = bench.time("threads=1", lambda: run(1), repeat=3)
+    for threads in (2, 4, 8):
+        seconds = bench.time(f"threads={threads}", lambda: run(threads), repeat=3)
+        if free_threaded and cpus >= threads:
+            # Parsers share no mutable state, so nothing serializes the
+            # threads once the interpreter lets them run together.
+            assert seconds < single / (threads * 0.5)
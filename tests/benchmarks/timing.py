@@ -0,0 +1,14 @@
+import typing as t
+import timeit
+
+
+class Bench:
+    def __init__(self) -> None:
+        self.results = dict[str, float]()
+
+    def time(
+        self, label: str, func: t.Callable[[], t.Any], number: int = 1, repeat: int = 5
+    ) -> float:
+        seconds = min(timeit.repeat(func, number=number, repeat=repeat)) / number
+        self.results[label] = seconds
+        return seconds
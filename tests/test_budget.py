@@ -0,0 +1,131 @@
+import time
+
+import pytest
+
+from budget import Budget, BudgetExceeded
+from combinators import Filter, Just, PR, Recursive, choice, one_of
+from generalized import generalized
+from span import Span
+from stream import Stream
+
+A = Just("a")
+
+
+def _exceeded(result: object) -> BudgetExceeded:
+    match result:
+        case PR.Error(BudgetExceeded() as kind, _):
+            return kind
+        case other:
+            pytest.fail(f"Expected a budget error, got {other}")
+
+
+def test_within_budget_matches() -> None:
+    parser = A.repeated().budgeted(Budget(max_steps=100))
+    assert parser.parse(Stream.from_source("aaa")).item == ["a", "a", "a"]
+
+
+def test_step_limit() -> None:
+    parser = A.repeated().budgeted(Budget(max_steps=5))
+    assert _exceeded(parser.parse(Stream.from_source("a" * 10))) is BudgetExceeded.Steps
+
+
+def test_backtrack_limit() -> None:
+    parser = choice([Just("x"), Just("y"), A]).repeated()
+    budgeted = parser.budgeted(Budget(max_backtracks=3))
+    kind = _exceeded(budgeted.parse(Stream.from_source("aaaa")))
+    assert kind is BudgetExceeded.Backtracks
+
+
+def test_deadline() -> None:
+    def slow(item: str) -> bool:
+        time.sleep(0.00005)
+        return True
+
+    parser = Filter(slow).repeated().budgeted(Budget(timeout=0.01))
+    kind = _exceeded(parser.parse(Stream.from_source("a" * 5000)))
+    assert kind is BudgetExceeded.Deadline
+
+
+def test_deadline_is_checked_on_the_first_step() -> None:
+    def slow(item: str) -> bool:
+        time.sleep(0.01)
+        return item == "a"
+
+    parser = Filter(slow).then(A).budgeted(Budget(timeout=0.005))
+    kind = _exceeded(parser.parse(Stream.from_source("aa")))
+    assert kind is BudgetExceeded.Deadline
+
+
+def test_generalized_engine_is_metered() -> None:
+    # Every leaf scan is memoized, so the cubic chart work of an ambiguous
+    # grammar has to be charged by the engine itself.
+    expr = Recursive[str, object, object]()
+    expr.define(expr.then_ignore(Just("+")).then(expr) | one_of("0123456789"))
+    source = Stream.from_source("+".join("1" * 120))
+
+    steps = generalized(expr).budgeted(Budget(max_steps=10_000))
+    assert _exceeded(steps.parse(source)) is BudgetExceeded.Steps
+
+    started = time.monotonic()
+    deadline = generalized(expr).budgeted(Budget(timeout=0.05))
+    assert _exceeded(deadline.parse(source)) is BudgetExceeded.Deadline
+    assert time.monotonic() - started < 0.5
+
+
+def test_error_carries_furthest_span() -> None:
+    parser = A.repeated().then(Just("b")).budgeted(Budget(max_steps=4))
+    match parser.parse(Stream.from_source("aaaaaa", span_base=100)):
+        case PR.Error(BudgetExceeded.Steps, span):
+            # The fifth step, at offset 4, is the one over the limit.
+            assert span == Span(104, 105)
+        case other:
+            pytest.fail(f"Expected a step error, got {other}")
+
+
+def test_inner_budget_cannot_lift_outer_limit() -> None:
+    inner = A.repeated().budgeted(Budget(max_steps=1000))
+    parser = inner.then(Just("b")).budgeted(Budget(max_steps=3))
+    kind = _exceeded(parser.parse(Stream.from_source("a" * 10 + "b")))
+    assert kind is BudgetExceeded.Steps
+
+
+def test_inner_budget_reports_its_own_limit() -> None:
+    inner = A.repeated().budgeted(Budget(max_steps=3))
+    parser = inner.or_not().then(Just("b")).budgeted(Budget(max_steps=1000))
+    match parser.parse(Stream.from_source("a" * 10 + "b")):
+        case PR.Error(BudgetExceeded.Steps, span):
+            assert span == Span(3, 4)
+        case other:
+            pytest.fail(f"Expected the inner step error, got {other}")
+
+
+def test_user_errors_pass_through() -> None:
+    parser = A.then(Just("b").require("b")).budgeted(Budget(max_steps=100))
+    match parser.parse(Stream.from_source("ax")):
+        case PR.Error("b", _):
+            pass
+        case other:
+            pytest.fail(f"Expected the require error, got {other}")
+
+
+def test_exponential_grammar_is_cut_off() -> None:
+    expr = Recursive[str, object, object]()
+    term = expr.delimited_by(Just("("), Just(")")) | one_of("0123456789")
+    expr.define(
+        choice(
+            [
+                term.then_ignore(Just("+")).then(expr),
+                term.then_ignore(Just("-")).then(expr),
+                term,
+            ]
+        )
+    )
+    source = "(" * 30 + "1" + ")" * 30
+    parser = expr.budgeted(Budget(max_steps=10_000))
+    assert _exceeded(parser.parse(Stream.from_source(source))) is BudgetExceeded.Steps
+
+
+def test_budgets_compose_with_cursor_and_deferred_modes() -> None:
+    parser = A.map(str.upper).repeated().budgeted(Budget(max_steps=100))
+    for mode in (parser.cursored(), parser.deferred()):
+        assert mode.parse(Stream.from_source("aa")).item == ["A", "A"]
@@ -0,0 +1,100 @@
+import gc
+import os
+import pathlib
+import typing as t
+import weakref
+
+from cache import ParseCache
+from combinators import Just, Parser, PR, take_while
+
+NUMBERS = (
+    take_while("0123456789").at_least(1).map(lambda run: int(run.item))
+    .then_ignore(Just("\n"))
+    .repeated()
+)
+SOURCE = "".join(f"{number}\n" for number in range(1000))
+
+
+def _numbers() -> Parser[str, t.Any, t.Any]:
+    return NUMBERS.map(list)
+
+
+def test_hit_returns_the_stored_result() -> None:
+    cache = ParseCache()
+    first = cache.parse(NUMBERS, SOURCE)
+    assert cache.parse(NUMBERS, SOURCE) is first
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+    assert isinstance(first, PR.Match)
+    assert first.item == list(range(1000))
+
+
+def test_max_bytes_counts_the_retained_result() -> None:
+    # Each result keeps a thousand ints and their list alive, several times
+    # the size of its source text.
+    cache = ParseCache()
+    cache.parse(NUMBERS, SOURCE)
+    retained = cache._bytes
+    assert retained > 2 * len(SOURCE)
+
+    cache = ParseCache(max_bytes=2 * retained)
+    for _ in range(3):
+        cache.parse(_numbers(), SOURCE)
+    assert cache._bytes <= 2 * retained
+    assert cache.stats.evictions == 1
+
+
+def test_evicted_grammars_are_released() -> None:
+    cache = ParseCache(max_entries=1)
+    parser = _numbers()
+    released = weakref.ref(parser)
+    cache.parse(parser, SOURCE)
+    del parser
+
+    cache.parse(NUMBERS, SOURCE)
+    gc.collect()
+    assert released() is None
+    assert len(cache._grammars) == 1
+
+
+def test_parse_file_skips_unchanged_files(tmp_path: pathlib.Path) -> None:
+    path = tmp_path / "numbers.txt"
+    path.write_text(SOURCE)
+    cache = ParseCache()
+
+    first = cache.parse_file(NUMBERS, path)
+    assert cache.parse_file(NUMBERS, path) is first
+
+    path.write_text(SOURCE + "1000\n")
+    os.utime(path, ns=(0, 0))
+    changed = cache.parse_file(NUMBERS, path)
+    assert isinstance(changed, PR.Match)
+    assert changed.item[-1] == 1000
+    assert cache.stats.invalidations == 1
+
+
+def test_hits_name_the_callers_file(tmp_path: pathlib.Path) -> None:
+    first, second = tmp_path / "a.txt", tmp_path / "b.txt"
+    first.write_text(SOURCE)
+    second.write_text(SOURCE)
+    cache = ParseCache()
+
+    for path in [first, second, first]:
+        result = cache.parse_file(NUMBERS, path)
+        assert isinstance(result, PR.Match)
+        assert result.remaining.file_handle == path
+    assert cache.stats.misses == 1
+
+    result = cache.parse(NUMBERS, SOURCE)
+    assert isinstance(result, PR.Match)
+    assert result.remaining.file_handle is None
+    assert result.remaining.position == len(SOURCE)
+
+
+def test_results_persist_with_a_grammar_key(tmp_path: pathlib.Path) -> None:
+    ParseCache(directory=tmp_path).parse(NUMBERS, SOURCE, grammar_key="numbers")
+
+    cache = ParseCache(directory=tmp_path)
+    result = cache.parse(NUMBERS, SOURCE, grammar_key="numbers")
+    assert cache.stats.disk_hits == 1
+    assert isinstance(result, PR.Match)
+    assert result.item == list(range(1000))
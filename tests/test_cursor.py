@@ -0,0 +1,108 @@
+import typing as t
+
+import pytest
+
+from combinators import Just, Parser, PR, choice, one_of, startswith, take_while
+from span import Span, Spanned
+from stream import Cursor, Stream
+
+A, B, C = Just("a"), Just("b"), Just("c")
+AB = A.then(B)
+COMMA = Just(",")
+# A separator that can fail after consuming its first item.
+COMMA_SPACE = COMMA.then(Just(" "))
+DIGIT = one_of("0123456789")
+
+# Every combinator that takes a mark and rewinds after a failed attempt, each
+# given a branch that fails part way through so a missing rewind shows up.
+GRAMMARS: dict[str, Parser[str, t.Any, t.Any]] = {
+    "alternative": AB | A.then(C) | A,
+    "choice": choice([AB, A.then(C), startswith("ac"), A]),
+    "or_not": AB.or_not().then(A.or_not()),
+    "or_else": AB.or_else(("-", "-")).then(take_while("abc")),
+    "boolean": AB.boolean().then(A.boolean()),
+    "repeated": AB.repeated().then(A.or_not()),
+    "repeated_at_least": AB.repeated().at_least(2),
+    "separated": AB.separated_by(COMMA),
+    "separated_leading": AB.separated_by(COMMA).allow_leading(),
+    "separated_trailing": AB.separated_by(COMMA).allow_trailing(),
+    "separated_both": AB.separated_by(COMMA).allow_leading().allow_trailing(),
+    "separated_at_least": AB.separated_by(COMMA).at_least(2),
+    "separated_partial": AB.separated_by(COMMA_SPACE)
+    .allow_leading()
+    .allow_trailing()
+    .then(take_while(",")),
+    "require": A.then(B.require("b")) | C,
+    "require_after_rewind": (AB | A).then(C.require("c")),
+    # `Spanned` needs a non-empty match.
+    "spanned": (AB | A).spanned().then(take_while("bc,").at_least(1).spanned()),
+    "nested": (AB | A.then(C)).repeated().at_least(1).separated_by(COMMA)
+    .at_least(1).spanned(),
+    "delimited": DIGIT.repeated().delimited_by(A, B) | A.then(DIGIT),
+}
+
+SOURCES = [
+    *["", "a", "ab", "ac", "aba", "abab", "ababac", "acab", "ba", "c", "x"],
+    *["ab,", "ab,ab", ",ab,ab,", "ab,ac", "ab,,", ",ab"],
+    *[", ab, ab, ", "ab, ab,"],
+    *["a1", "a1b", "a12b"],
+]
+
+
+def _outcome(result: t.Any) -> t.Any:
+    match result:
+        case PR.Match(item, remaining):
+            assert type(remaining) is Stream, "Cursors must not leak out"
+            return item, remaining.position
+        case other:
+            return other
+
+
+@pytest.mark.parametrize("name", GRAMMARS)
+def test_cursored_matches_plain(name: str) -> None:
+    parser = GRAMMARS[name]
+    for source in SOURCES:
+        for start in range(len(source) + 1):
+            stream = Stream.from_source(source).advance(start)
+            plain = _outcome(parser.parse(stream))
+            cursored = _outcome(parser.cursored().parse(stream))
+            assert cursored == plain, (name, source, start)
+            assert stream.position == start
+
+
+def test_spans_are_global_under_a_cursor() -> None:
+    parser = (AB | A).spanned().cursored()
+    match parser.parse(Stream.from_source("xxab", span_base=100).advance(2)):
+        case PR.Match(item, remaining):
+            assert item == Spanned(("a", "b"), Span(102, 104))
+            assert remaining.position == 4
+        case other:
+            pytest.fail(f"Expected a match, got {other}")
+
+
+def test_require_error_points_past_the_rewound_branch() -> None:
+    parser = GRAMMARS["require_after_rewind"]
+    expected = parser.parse(Stream.from_source("abx"))
+    assert isinstance(expected, PR.Error)
+    assert parser.cursored().parse(Stream.from_source("abx")) == expected
+
+
+def test_cursor_moves_in_place() -> None:
+    cursor = Cursor.at(Stream.from_source("abc"))
+    mark = cursor.mark()
+    assert cursor.advance(2) is cursor
+    assert cursor.position == 2
+    cursor.rewind(mark)
+    assert cursor.position == 0
+    assert cursor.advance(10).position == 3
+
+
+def test_nested_cursored_reuses_the_cursor() -> None:
+    inner = AB.cursored()
+    parser = inner.repeated().cursored()
+    match parser.parse(Stream.from_source("ababa")):
+        case PR.Match(items, remaining):
+            assert items == [("a", "b"), ("a", "b")]
+            assert remaining.position == 4
+        case other:
+            pytest.fail(f"Expected a match, got {other}")
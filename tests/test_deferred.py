@@ -0,0 +1,145 @@
+import typing as t
+
+import pytest
+
+from combinators import (
+    Just,
+    Parser,
+    PR,
+    choice,
+    ignore,
+    one_of,
+    recursive,
+    seq,
+    take_while,
+)
+from generalized import generalized
+from pratt import Infix, Prefix, precedence
+from stream import Stream
+import deferred
+
+NUM = one_of("0123456789").map(int)
+TABLE = [
+    Infix(Just("+"), 1, lambda a, _, b: ("+", a, b)),
+    Infix(Just("*"), 2, lambda a, _, b: ("*", a, b)),
+    Prefix(Just("-"), 3, lambda _, a: ("-", a)),
+]
+
+GRAMMARS: list[tuple[Parser[str, t.Any, t.Any], str]] = [
+    (NUM.then(NUM).map(lambda ab: ab[0] + ab[1]), "12"),
+    (NUM.then_chain(NUM.repeated()), "1234"),
+    (NUM.to("n").spanned(), "1"),
+    (NUM.or_not().then(Just("x")), "x"),
+    (NUM.separated_by(Just(",")).allow_trailing(), "1,2,3,"),
+    (NUM.delimited_by(Just("("), Just(")")), "(4)"),
+    (NUM.then_with_ctx(lambda n, s: Just("b").map(str.upper).parse(s)), "1b"),
+    (NUM.and_check(lambda n: n > 2).map(str), "3"),
+    (seq(NUM, ignore(Just("+")), NUM, into=lambda a, b: a + b), "1+2"),
+    (seq(NUM, NUM.map(str)), "12"),
+    (choice([NUM.then(Just("a")), NUM.then(Just("b"))]).map(repr), "1b"),
+    (precedence(NUM, TABLE), "-1+2*3"),
+    (generalized(precedence(NUM, TABLE).map(lambda e: ("expr", e))), "1+2"),
+    (
+        generalized(
+            NUM.then_with_ctx(lambda _, s: Just("b").map(str.upper).parse(s))
+            .map(lambda p: p[1])
+        ),
+        "1b",
+    ),
+    (
+        recursive(
+            lambda nested: nested.delimited_by(Just("["), Just("]")).map(
+                lambda inner: [inner]
+            )
+            | NUM
+        ),
+        "[[[7]]]",
+    ),
+]
+
+
+@pytest.mark.parametrize("parser, source", GRAMMARS)
+def test_same_result_as_eager(parser: Parser[str, t.Any, t.Any], source: str) -> None:
+    eager = parser.parse(Stream.from_source(source))
+    lazy = parser.deferred().parse(Stream.from_source(source))
+    match eager, lazy:
+        case PR.Match(item, pos), PR.Match(lazy_item, lazy_pos):
+            assert not deferred.is_lazy(lazy_item)
+            assert lazy_item == item
+            assert lazy_pos.position == pos.position
+        case _:
+            pytest.fail(f"Expected matches, got {eager} and {lazy}")
+
+
+def test_then_with_ctx_result_is_forced() -> None:
+    parser = Just("a").then_with_ctx(
+        lambda _, stream: Just("b").map(str.upper).parse(stream)
+    )
+    assert parser.deferred().parse(Stream.from_source("ab")).item == ("a", "B")
+
+
+def test_mappers_only_run_on_committed_path() -> None:
+    calls = list[str]()
+
+    def record(label: str) -> t.Callable[[t.Any], str]:
+        def mapper(item: t.Any) -> str:
+            calls.append(label)
+            return label
+
+        return mapper
+
+    parser = choice(
+        [
+            NUM.map(record("abandoned")).then(Just("a")),
+            NUM.map(record("committed")).then(Just("b")),
+        ]
+    )
+
+    parser.parse(Stream.from_source("1b"))
+    assert calls == ["abandoned", "committed"]
+
+    calls.clear()
+    parser.deferred().parse(Stream.from_source("1b"))
+    assert calls == ["committed"]
+
+
+def test_forcing_runs_actions_left_to_right() -> None:
+    order = list[int]()
+
+    def note(number: int) -> int:
+        order.append(number)
+        return number
+
+    parser = NUM.map(note).repeated()
+    parser.deferred().parse(Stream.from_source("31415"))
+    assert order == [3, 1, 4, 1, 5]
+
+
+def test_deep_precedence_chain() -> None:
+    # Builds a 5000-deep left-nested thunk chain; the values stay flat so the
+    # comparison itself does not recurse.
+    source = "+".join("1" * 5000)
+    parser = precedence(NUM, [Infix(Just("+"), 1, lambda a, _, b: a + b)])
+    assert parser.parse(Stream.from_source(source)).item == 5000
+    assert parser.deferred().parse(Stream.from_source(source)).item == 5000
+
+
+def test_deep_thunk_chain() -> None:
+    value = deferred.delay(int, "0")
+    for _ in range(100_000):
+        value = deferred.delay(lambda number: number + 1, value)
+    assert deferred.force(value) == 100_000
+
+
+def test_shared_thunk_is_forced_once() -> None:
+    calls = list[None]()
+    shared = deferred.delay(lambda: calls.append(None) or 1)
+    pair = deferred.delay(lambda a, b: a + b, shared, shared)
+    assert deferred.force(pair) == 2
+    assert len(calls) == 1
+
+
+def test_spans_from_take_while_are_kept() -> None:
+    parser = take_while("ab").map(lambda run: run.span)
+    eager = parser.parse(Stream.from_source("abx")).item
+    assert parser.deferred().parse(Stream.from_source("abx")).item == eager
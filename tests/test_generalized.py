@@ -0,0 +1,143 @@
+import typing as t
+
+import pytest
+
+from combinators import (
+    Just,
+    one_of,
+    Parser,
+    ParseResultType,
+    PR,
+    Recursive,
+    choice,
+    ignore,
+    recursive,
+    seq,
+    take_while,
+)
+from generalized import generalized
+from span import Span, Spanned
+from stream import Stream
+
+NUM = one_of("0123456789").map(int)
+OPEN = Just("[")
+CLOSE = Just("]")
+COMMA = Just(",")
+SUM = recursive(
+    lambda expr: expr.then_ignore(Just("+")).then(expr).map(lambda ab: ("+", *ab))
+    | NUM
+)
+
+
+def _parse(
+    parser: Parser[str, t.Any, t.Any], source: str
+) -> ParseResultType[str, t.Any, t.Any]:
+    return parser.parse(Stream.from_source(source))
+
+
+def test_left_recursion() -> None:
+    numbers = recursive(
+        lambda items: items.then_ignore(Just(",")).then(NUM).map(
+            lambda ab: [*ab[0], ab[1]]
+        )
+        | NUM.map(lambda number: [number])
+    )
+    match _parse(generalized(numbers), "1,2,3,4x"):
+        case PR.Match(items, pos):
+            assert items == [1, 2, 3, 4]
+            assert pos.position == 7
+        case other:
+            pytest.fail(f"Expected a match, got {other}")
+
+
+def test_disambiguation_hook_picks_among_derivations() -> None:
+    seen = list[list[object]]()
+
+    def last(parser: object, candidates: list[object]) -> object:
+        seen.append(candidates)
+        return candidates[-1]
+
+    first = _parse(generalized(SUM), "1+2+3").item
+    other = _parse(generalized(SUM, last), "1+2+3").item
+    assert {first, other} == {("+", ("+", 1, 2), 3), ("+", 1, ("+", 2, 3))}
+    assert any(len(candidates) == 2 for candidates in seen)
+
+
+@pytest.mark.parametrize(
+    "parser, source",
+    [
+        (NUM.separated_by(COMMA).allow_trailing().delimited_by(OPEN, CLOSE), "[1,]"),
+        (NUM.separated_by(COMMA).delimited_by(OPEN, CLOSE), "[]"),
+        (NUM.repeated().at_least(2), "1"),
+        (NUM.repeated().at_least(2), "123"),
+        (Just("a").or_not().then(Just("b").spanned()), "b"),
+        (Just("a").or_else("-").then(Just("b")), "ab"),
+        (Just("a").boolean().then(Just("b")), "b"),
+        (take_while("ab").then(Just("c")), "abac"),
+        (NUM.and_check(lambda number: number > 4), "3"),
+        (seq(NUM, ignore(Just("+")), NUM, into=lambda a, b: a + b), "3+4"),
+        (choice([Just("x"), NUM.to("digit")]), "7"),
+        (NUM.require("number"), "x"),
+        (Just("1").then(NUM.require("number")), "1x"),
+        (Just("1").then(NUM.require("number")), "12"),
+        (Just("a").then(Just(";").require("missing ;")).repeated(), "a;ax"),
+        (Just("a").then(Just(";").require("missing ;")).repeated(), "ax"),
+        (Just("a").then(Just(";").require("missing ;")).repeated(), "a;a;"),
+    ],
+)
+def test_matches_backtracking_on_unambiguous_grammars(
+    parser: Parser[str, t.Any, t.Any], source: str
+) -> None:
+    expected = _parse(parser, source)
+    actual = _parse(generalized(parser), source)
+    match expected, actual:
+        case PR.Match(item, pos), PR.Match(other_item, other_pos):
+            assert item == other_item
+            assert pos.position == other_pos.position
+        case _:
+            assert actual == expected
+
+
+def test_spanned_covers_match() -> None:
+    match _parse(generalized(Just("a").then(Just("b")).spanned()), "ab"):
+        case PR.Match(item, _):
+            assert item == Spanned(("a", "b"), Span(0, 2))
+        case other:
+            pytest.fail(f"Expected a match, got {other}")
+
+
+def test_require_yields_to_a_matching_branch() -> None:
+    parser = Just("a").then(NUM.require("number")) | Just("a").then(Just("b"))
+    assert _parse(parser, "ab").is_error()
+    assert _parse(generalized(parser), "ab").item == ("a", "b")
+
+
+def test_exponential_backtracking_grammar() -> None:
+    expr = Recursive[str, object, object]()
+    term = expr.delimited_by(Just("("), Just(")")) | NUM
+    expr.define(
+        choice(
+            [
+                term.then_ignore(Just("+")).then(expr),
+                term.then_ignore(Just("-")).then(expr),
+                term,
+            ]
+        )
+    )
+    source = "(" * 12 + "1" + ")" * 12 + "+2"
+    assert _parse(generalized(expr), source).item == (1, 2)
+
+
+def test_cursored_input_is_restored() -> None:
+    parser = generalized(NUM.repeated()).cursored()
+    match _parse(parser, "12x"):
+        case PR.Match(items, pos):
+            assert items == [1, 2]
+            assert pos.position == 2
+        case other:
+            pytest.fail(f"Expected a match, got {other}")
+
+
+def test_long_repetition_does_not_recurse() -> None:
+    items = _parse(generalized(NUM.repeated()), "1" * 5000).item
+    assert len(items) == 5000
@@ -0,0 +1,59 @@
+import typing as t
+
+import pytest
+
+from combinators import Just, Parser, PR, Recursive, filter, one_of, take_while
+from generate import Knobs, corpus, sentence
+from stream import Stream
+
+DIGIT = one_of("0123456789")
+EXPR = Recursive[str, t.Any, t.Any]()
+FACTOR = DIGIT | EXPR.delimited_by(Just("("), Just(")"))
+TERM = FACTOR.then(Just("*").then(FACTOR).repeated())
+EXPR.define(TERM.then(Just("+").then(TERM).repeated()))
+
+
+def _parses(parser: Parser[str, t.Any, t.Any], text: str) -> bool:
+    match parser.parse(Stream.from_source(text)):
+        case PR.Match(_, pos):
+            return pos.position == len(text)
+        case _:
+            return False
+
+
+def test_sentence_is_valid_and_bounded() -> None:
+    for seed in range(20):
+        text = sentence(EXPR, seed=seed)
+        assert _parses(EXPR, text)
+        assert len(text) < 2 * Knobs().sentence_bytes
+
+
+def test_sentence_bytes_bounds_a_deep_grammar() -> None:
+    knobs = Knobs(max_depth=1000, max_repeat=8, sentence_bytes=256)
+    for seed in range(10):
+        text = sentence(EXPR, seed=seed, knobs=knobs)
+        assert _parses(EXPR, text)
+        assert len(text) < 1024
+
+
+def test_sentence_is_reproducible() -> None:
+    assert sentence(EXPR, seed=7) == sentence(EXPR, seed=7)
+
+
+def test_corpus_ends_near_size() -> None:
+    text = "".join(corpus(EXPR, size=200, seed=1))
+    assert 200 <= len(text) < 400
+    assert all(_parses(EXPR, line) for line in text.splitlines())
+
+
+def test_corpus_validate_keeps_parseable_sentences() -> None:
+    keyword = Just("a").then(Just("b")) | Just("a")
+    for line in "".join(corpus(keyword, size=50, seed=3, validate=True)).split():
+        assert _parses(keyword, line)
+
+
+def test_unsupported_parsers() -> None:
+    with pytest.raises(TypeError):
+        sentence(filter(str.isdigit))
+    with pytest.raises(ValueError):
+        sentence(take_while(str.isdigit).at_least(1))
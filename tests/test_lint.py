@@ -0,0 +1,90 @@
+import typing as t
+from dataclasses import dataclass
+
+import pytest
+
+from combinators import (
+    NoProgress,
+    Just,
+    Parser,
+    ParseResultType,
+    PR,
+    Recursive,
+    startswith,
+    take_while,
+)
+from lint import Lint, lint
+from pratt import Postfix, precedence
+from span import Span
+from stream import Stream
+
+
+@dataclass(frozen=True)
+class Ident(Parser[str, str, t.Any]):
+    # A parser the linter knows nothing about.
+    @t.override
+    def parse(self, input: Stream[str]) -> ParseResultType[str, str, t.Any]:
+        end = input.position
+        while end < len(input) and input.items[end].isalpha():
+            end += 1
+        if end == input.position:
+            return PR.NoMatch
+        text = "".join(input.items[input.position : end])
+        return PR.Match(text, input.advance(end - input.position))
+
+
+def _kinds(parser: Parser[t.Any, t.Any, t.Any]) -> list[Lint]:
+    return [finding.kind for finding in lint(parser)]
+
+
+def test_nullable_repetition() -> None:
+    assert _kinds(Just("a").or_not().repeated()) == [Lint.InfiniteRepetition]
+    assert _kinds(take_while("a").separated_by(take_while(","))) == [
+        Lint.InfiniteRepetition
+    ]
+    assert _kinds(Just("a").repeated()) == []
+
+
+def test_unknown_leaves_consume_input() -> None:
+    assert _kinds(Ident().repeated()) == []
+    assert _kinds(Ident().map(str.upper).repeated()) == []
+
+
+def test_unreachable_branches() -> None:
+    assert _kinds(Just("a") | Just("a").then(Just("b"))) == [Lint.UnreachableBranch]
+    assert _kinds(Just("a").or_not() | Just("b")) == [Lint.UnreachableBranch]
+    assert _kinds(Just("a").then(Just("b")) | Just("a")) == []
+
+
+def test_empty_startswith_never_matches() -> None:
+    empty = startswith("")
+    assert empty.parse(Stream.from_source("x")) is PR.NoMatch
+    assert _kinds(empty | Just("x")) == []
+    assert _kinds(empty.repeated()) == []
+
+
+def test_left_recursion() -> None:
+    expr = Recursive[str, t.Any, t.Any]()
+    expr.define(expr.then(Just("+")).then(Just("1")) | Just("1"))
+    assert Lint.LeftRecursion in _kinds(expr)
+
+    guarded = Recursive[str, t.Any, t.Any]()
+    guarded.define(Just("(").ignore_then(guarded).then_ignore(Just(")")) | Just("1"))
+    assert _kinds(guarded) == []
+
+
+def test_shared_prefix() -> None:
+    word = Ident().map(str.lower)
+    assert _kinds(word.then(Just("!")) | word.then(Just("?"))) == [Lint.SharedPrefix]
+
+
+def test_repetition_without_progress_raises() -> None:
+    with pytest.raises(NoProgress) as raised:
+        Just("a").or_not().repeated().parse(Stream.from_source("aab"))
+    assert raised.value.span == Span(2, 3)
+
+
+def test_postfix_without_progress_raises() -> None:
+    table = precedence(Just("1"), [Postfix(Just("!").or_not(), 1, lambda a, _: a)])
+    with pytest.raises(NoProgress):
+        table.parse(Stream.from_source("1"))
@@ -0,0 +1,116 @@
+import multiprocessing
+import typing as t
+
+import pytest
+
+from combinators import Just, Nothing, Parser, PR, take_while
+from parallel import parse_parallel
+from span import Span, Spanned
+from stream import Stream
+
+# Module-level functions rather than lambdas, so the grammars pickle and
+# workers can be started the platform's default way.
+def _number(run: Spanned[t.Sequence[str]]) -> int:
+    return int(t.cast(str, run.item))
+
+
+def _not_1500(number: int) -> bool:
+    return number != 1500
+
+
+DIGITS = take_while("0123456789").at_least(1).map(_number)
+LINE = DIGITS.then_ignore(Just("\n"))
+LINES = LINE.repeated()
+SOURCE = "".join(f"{number}\n" for number in range(2000))
+# Start of the line after the one that ends at or past offset 5000.
+MIDDLE = SOURCE.index("\n", 5000) + 1
+
+
+def _sequential[Out, Err](
+    parser: Parser[str, Out, Err], source: str
+) -> PR.Match[str, Out] | PR.NoMatchType | PR.Error[Err]:
+    return parser.parse(Stream.from_source(source))
+
+
+def _assert_same(
+    parallel: t.Any,
+    sequential: t.Any,
+) -> None:
+    match parallel, sequential:
+        case PR.Match(items, pos), PR.Match(expected, expected_pos):
+            assert items == expected
+            assert pos.position == expected_pos.position
+            assert pos.span_of(1) == expected_pos.span_of(1)
+        case _:
+            assert parallel == sequential
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_matches_sequential(workers: int) -> None:
+    result = parse_parallel(LINES, SOURCE, "\n", workers=workers)
+    _assert_same(result, _sequential(LINES, SOURCE))
+    assert result.is_match() and result.remaining.position == len(SOURCE)
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_stops_where_sequential_stops(workers: int) -> None:
+    source = SOURCE[:MIDDLE] + "x\n" + SOURCE[MIDDLE:]
+    result = parse_parallel(LINES, source, "\n", workers=workers)
+    _assert_same(result, _sequential(LINES, source))
+    assert result.is_match() and result.remaining.position == MIDDLE
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_no_match_in_later_chunk(workers: int) -> None:
+    whole = LINE.and_check(_not_1500).repeated()
+    parser = whole.then_ignore(Nothing())
+    assert _sequential(parser, SOURCE) is PR.NoMatch
+    assert parse_parallel(parser, SOURCE, "\n", workers=workers) is PR.NoMatch
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_error_span_is_global(workers: int) -> None:
+    parser = DIGITS.then_ignore(Just("\n").require("newline")).repeated()
+    source = SOURCE[:MIDDLE] + "5x\n" + SOURCE[MIDDLE:]
+    result = parse_parallel(parser, source, "\n", workers=workers)
+    assert result == _sequential(parser, source)
+    match result:
+        case PR.Error(kind, span):
+            assert kind == "newline"
+            # `Require` points at the last item consumed, the inserted "5".
+            assert span == Span(MIDDLE, MIDDLE + 1)
+        case other:
+            pytest.fail(f"Expected an error, got {other}")
+
+
+def test_spawned_workers_receive_the_grammar() -> None:
+    result = parse_parallel(LINES, SOURCE, "\n", workers=2, start_method="spawn")
+    _assert_same(result, _sequential(LINES, SOURCE))
+
+
+@pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(), reason="needs fork"
+)
+def test_forked_workers_inherit_unpicklable_grammars() -> None:
+    parser = LINES.map(lambda numbers: [-number for number in numbers])
+    result = parse_parallel(parser, SOURCE, "\n", workers=3, start_method="fork")
+    _assert_same(result, _sequential(parser, SOURCE))
+
+
+def test_resync_parser_and_callable_split() -> None:
+    expected = _sequential(LINES, SOURCE)
+    _assert_same(parse_parallel(LINES, SOURCE, Just("\n"), workers=1), expected)
+
+    def after_newline(source: str, index: int) -> int:
+        return source.find("\n", index) + 1 or len(source)
+
+    _assert_same(parse_parallel(LINES, SOURCE, after_newline, workers=1), expected)
+
+
+def test_empty_source() -> None:
+    match parse_parallel(LINES, "", "\n", workers=2):
+        case PR.Match(items, pos):
+            assert items == []
+            assert pos.position == 0
+        case other:
+            pytest.fail(f"Expected a match, got {other}")
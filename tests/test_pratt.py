@@ -0,0 +1,108 @@
+import typing as t
+
+import pytest
+
+from combinators import Just, PR, Parser, one_of, startswith, take_while
+from pratt import Assoc, Infix, Postfix, Prefix, precedence
+from stream import Stream
+
+NUM = one_of("0123456789").map(int)
+
+
+def _binary(op: str) -> Infix[str, str, t.Any, t.Any]:
+    assoc = ASSOC.get(op, Assoc.Left)
+    return Infix(Just(op), POWERS[op], lambda a, o, b: (o, a, b), assoc)
+
+
+POWERS = {"=": 1, "+": 2, "-": 2, "*": 3, "/": 3, "^": 5}
+ASSOC = {"=": Assoc.Right, "^": Assoc.Right}
+
+TABLE = [
+    *(_binary(op) for op in POWERS),
+    Prefix(Just("-"), 4, lambda o, a: ("neg", a)),
+    Postfix(Just("!"), 6, lambda a, o: ("!", a)),
+]
+EXPR = precedence(NUM, TABLE)
+
+
+def _parse(parser: Parser[str, t.Any, t.Any], source: str) -> t.Any:
+    match parser.parse(Stream.from_source(source)):
+        case PR.Match(item, pos):
+            assert pos.position == len(source), f"stopped at {pos.position}"
+            return item
+        case other:
+            pytest.fail(f"Expected a match, got {other}")
+
+
+@pytest.mark.parametrize(
+    "source, expected",
+    [
+        ("1", 1),
+        ("1+2*3", ("+", 1, ("*", 2, 3))),
+        ("1*2+3", ("+", ("*", 1, 2), 3)),
+        ("1-2-3", ("-", ("-", 1, 2), 3)),
+        ("2^3^4", ("^", 2, ("^", 3, 4))),
+        ("1=2=3", ("=", 1, ("=", 2, 3))),
+        ("-1+2", ("+", ("neg", 1), 2)),
+        ("-2^2", ("neg", ("^", 2, 2))),
+        ("3!*2", ("*", ("!", 3), 2)),
+        ("-3!", ("neg", ("!", 3))),
+    ],
+)
+def test_binding_powers_and_associativity(source: str, expected: t.Any) -> None:
+    assert _parse(EXPR, source) == expected
+
+
+def test_stops_before_dangling_operator() -> None:
+    match EXPR.parse(Stream.from_source("1+2+")):
+        case PR.Match(item, pos):
+            assert item == ("+", 1, 2)
+            assert pos.position == 3
+        case other:
+            pytest.fail(f"Expected a match, got {other}")
+
+
+def test_no_operand() -> None:
+    assert EXPR.parse(Stream.from_source("+")) is PR.NoMatch
+
+
+def test_non_literal_operators() -> None:
+    word = take_while("abcdefghijklmnopqrstuvwxyz").at_least(1)
+    keyword = word.and_check(lambda run: run.item == "and")
+    conjunction = Infix(keyword, 1, lambda a, _, b: (a, b))
+    assert _parse(precedence(NUM, [conjunction]), "1and2") == (1, 2)
+
+
+def test_operators_are_tried_in_table_order() -> None:
+    table = precedence(
+        NUM,
+        [
+            Infix(startswith("**"), 6, lambda a, _, b: ("pow", a, b)),
+            Infix(Just("*"), 5, lambda a, _, b: ("mul", a, b)),
+            Prefix(Just("*"), 7, lambda _, a: ("deref", a)),
+        ],
+    )
+    assert table.parse(Stream.from_source("2**3")).item == ("pow", 2, 3)
+    assert table.parse(Stream.from_source("2*3")).item == ("mul", 2, 3)
+
+
+def test_matches_layered_formulation() -> None:
+    add = NUM.then(Just("+").then(NUM).repeated()).map(
+        lambda first_rest: _fold(first_rest[0], first_rest[1])
+    )
+    table = precedence(NUM, [Infix(Just("+"), 1, lambda a, o, b: (o, a, b))])
+    source = "1+2+3+4"
+    assert _parse(add, source) == _parse(table, source)
+
+
+def _fold(first: t.Any, rest: list[tuple[str, t.Any]]) -> t.Any:
+    for op, operand in rest:
+        first = (op, first, operand)
+    return first
+
+
+def test_cursored_and_deferred_modes() -> None:
+    source = "1+2*3-4!"
+    expected = _parse(EXPR, source)
+    assert _parse(EXPR.cursored(), source) == expected
+    assert _parse(EXPR.deferred(), source) == expected
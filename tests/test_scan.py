@@ -0,0 +1,135 @@
+import array
+import typing as t
+
+import pytest
+
+from combinators import filter, skip_while, take_while, PR
+from span import Span, Spanned
+from stream import Stream
+import scan
+
+
+def test_str_run_stops_at_first_non_member() -> None:
+    assert scan.run_length("  \t x", 0, " \t") == 4
+    assert scan.run_length("  \t x", 4, " \t") == 0
+    assert scan.run_length("abc", 3, "abc") == 0
+
+
+def test_str_run_escapes_regex_metacharacters() -> None:
+    assert scan.run_length("]^-\\[x", 0, "]^-\\[") == 5
+
+
+def test_str_run_rejects_multi_character_members() -> None:
+    with pytest.raises(ValueError):
+        scan.run_length("abab", 0, ["ab"])
+
+
+def test_predicate_run_starts_at_offset() -> None:
+    assert scan.run_length("abc123def", 3, str.isdigit) == 3
+
+
+def test_generic_sequence_run() -> None:
+    assert scan.run_length([1, 1, 2, 1], 0, {1}) == 2
+
+
+@pytest.mark.parametrize(
+    "buffer",
+    [
+        b"\x00\x00\x00\x01",
+        bytearray(b"\x00\x00\x00\x01"),
+        array.array("B", [0, 0, 0, 1]),
+    ],
+)
+def test_buffer_run(buffer: bytes | bytearray | array.array[int]) -> None:
+    assert scan.run_length(buffer, 0, {0}) == 3
+    assert scan.run_length(buffer, 3, {0}) == 0
+
+
+def test_buffer_run_crosses_window_boundaries() -> None:
+    pytest.importorskip("numpy")
+    length = scan._FIRST_WINDOW * 4 + 7
+    buffer = b"a" * length + b"b"
+    assert scan.run_length(buffer, 0, {ord("a")}) == length
+    assert scan.run_length(buffer, 5, {ord("a")}) == length - 5
+
+
+def test_wide_array_run() -> None:
+    pytest.importorskip("numpy")
+    values = array.array("q", [7] * 1000 + [8])
+    assert scan.run_length(values, 0, {7}) == 1000
+
+
+@pytest.mark.parametrize(
+    "buffer, members, expected",
+    [
+        (array.array("b", [1, 1, 2]), {1, 200}, 2),
+        (array.array("q", [5, 5, 6]), {5, 2**63}, 2),
+        (array.array("Q", [2**64 - 1, 0]), {2**64 - 1, -1}, 1),
+        (b"  x", {" ", 32}, 2),
+        (b"  x", {" "}, 0),
+        (array.array("d", [1.0, 1.5, 2.0]), {1, 1.5}, 2),
+        (array.array("B", [1, 1, 0]), {1.0, 1.5, None}, 2),
+    ],
+)
+def test_buffer_run_matches_item_comparison(
+    buffer: bytes | array.array[t.Any], members: set[t.Any], expected: int
+) -> None:
+    # Whether or not numpy is installed, a member matches the items it
+    # compares equal to, and members of other types are ignored.
+    assert scan.run_length(buffer, 0, members) == expected
+    assert scan._run_length_predicate(buffer, 0, members.__contains__) == expected
+
+
+def test_take_while_over_bytes_with_str_members() -> None:
+    match take_while(" ").parse(Stream.from_buffer(b"  x")):
+        case PR.Match(item, pos):
+            assert pos.position == 0
+            assert item.span == Span(0, 0)
+        case other:
+            pytest.fail(f"Expected a match, got {other}")
+
+
+def test_take_while_returns_slice_and_span() -> None:
+    stream = Stream.from_source("  1234 ", span_base=10).advance(2)
+    match take_while("0123456789").parse(stream):
+        case PR.Match(item, pos):
+            assert item == Spanned("1234", Span(12, 16))
+            assert pos.position == 6
+        case other:
+            pytest.fail(f"Expected a match, got {other}")
+
+
+def test_skip_while_returns_span() -> None:
+    match skip_while(" ").parse(Stream.from_source("   x")):
+        case PR.Match(item, pos):
+            assert item == Span(0, 3)
+            assert pos.position == 3
+        case other:
+            pytest.fail(f"Expected a match, got {other}")
+
+
+def test_at_least() -> None:
+    digits = take_while("0123456789").at_least(1)
+    assert digits.parse(Stream.from_source("x")) is PR.NoMatch
+    assert skip_while(" ").parse(Stream.from_source("x")).is_match()
+
+
+def test_matches_filter_repeated() -> None:
+    source = "aab ab bbba"
+    for start in range(len(source) + 1):
+        stream = Stream.from_source(source).advance(start)
+        bulk = take_while("ab").parse(stream)
+        single = filter(lambda c: c in "ab").repeated().parse(stream)
+        assert bulk.is_match() and single.is_match()
+        assert bulk.item.item == "".join(single.item)
+        assert bulk.remaining.position == single.remaining.position
+
+
+def test_buffer_stream() -> None:
+    stream = Stream.from_buffer(b"\x01\x01\x02")
+    match take_while({1}).parse(stream):
+        case PR.Match(item, pos):
+            assert item == Spanned(b"\x01\x01", Span(0, 2))
+            assert pos.position == 2
+        case other:
+            pytest.fail(f"Expected a match, got {other}")
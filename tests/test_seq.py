@@ -0,0 +1,61 @@
+import typing as t
+from dataclasses import dataclass
+
+from combinators import Just, PR, ignore, seq, take_while
+from lint import Lint, lint
+from stream import Stream
+
+NAME = take_while("abcdefghijklmnopqrstuvwxyz").at_least(1).map(lambda run: run.item)
+NUMBER = take_while("0123456789").at_least(1).map(lambda run: int(run.item))
+
+
+@dataclass(frozen=True)
+class Assign:
+    name: str
+    value: int
+
+
+def _parse(parser: t.Any, source: str) -> t.Any:
+    return parser.parse(Stream.from_source(source))
+
+
+def test_flat_tuple() -> None:
+    result = _parse(seq(NAME, Just("="), NUMBER), "x=12;")
+    assert isinstance(result, PR.Match)
+    assert result.item == ("x", "=", 12)
+    assert result.remaining.position == 4
+
+
+def test_ignored_elements_are_parsed_but_dropped() -> None:
+    parser = seq(NAME, ignore(Just("=")), NUMBER, ignore(Just(";")))
+    assert _parse(parser, "x=12;").item == ("x", 12)
+    assert _parse(parser, "x=12") is PR.NoMatch
+
+
+def test_into_builds_the_output() -> None:
+    parser = seq(NAME, ignore(Just("=")), NUMBER, into=Assign)
+    assert _parse(parser, "x=12").item == Assign("x", 12)
+
+
+def test_matches_the_chained_form() -> None:
+    chained = NAME.then_ignore(Just("=")).then(NUMBER).then_ignore(Just(";"))
+    flat = seq(NAME, ignore(Just("=")), NUMBER, ignore(Just(";")))
+    for source in ["x=12;", "x=12", "x=", "=1;", ""]:
+        expected = _parse(chained, source)
+        actual = _parse(flat, source)
+        if isinstance(expected, PR.Match):
+            assert actual.item == expected.item
+            assert actual.remaining.position == expected.remaining.position
+        else:
+            assert actual == expected
+
+
+def test_failure_rewinds_to_the_start() -> None:
+    parser = seq(NAME, Just("=")) | seq(NAME, Just(":"))
+    assert _parse(parser, "x:").item == ("x", ":")
+
+
+def test_lint_sees_through_seq() -> None:
+    assert [f.kind for f in lint(seq(Just("a").or_not()).repeated())] == [
+        Lint.InfiniteRepetition
+    ]
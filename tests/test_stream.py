@@ -0,0 +1,98 @@
+from combinators import Just, PR
+from span import Span, Spanned
+from stream import Cursor, Stream
+from union import Maybe
+
+TOKENS = [
+    Spanned("let", Span(0, 3)),
+    Spanned("x", Span(4, 5)),
+    Spanned("=", Span(6, 7)),
+]
+
+
+def test_from_source_offsets() -> None:
+    stream = Stream.from_source("abc", span_base=10)
+    assert list(stream.starts) == [10, 11, 12]
+    assert list(stream.ends) == [11, 12, 13]
+    assert list(stream) == [
+        Spanned("a", Span(10, 11)),
+        Spanned("b", Span(11, 12)),
+        Spanned("c", Span(12, 13)),
+    ]
+
+
+def test_map_shares_offset_columns() -> None:
+    stream = Stream.from_spans(TOKENS)
+    mapped = stream.map(str.upper)
+    assert mapped.items == ["LET", "X", "="]
+    assert mapped.starts is stream.starts
+    assert mapped.ends is stream.ends
+
+
+def test_peek_returns_spanned_view() -> None:
+    stream = Stream.from_spans(TOKENS).advance()
+    assert stream.peek() == Maybe.Some(Spanned("x", Span(4, 5)))
+    assert stream.peek_item() == Maybe.Some("x")
+    assert stream.advance(5).peek() is Maybe.Nil
+
+
+def test_token_stream_from_spans_keyword() -> None:
+    stream = Stream(None, spans=TOKENS)
+    assert stream.items == ["let", "x", "="]
+    assert Just("let").parse(stream).is_match()
+
+
+def test_token_stream_from_spans_positional() -> None:
+    stream = Stream(None, TOKENS, 1)
+    assert stream.position == 1
+    assert stream.peek_item() == Maybe.Some("x")
+
+
+def test_spans_view() -> None:
+    stream = Stream(None, TOKENS)
+    assert len(stream.spans) == 3
+    assert stream.spans[1] == TOKENS[1]
+    assert stream.spans[-1].span == Span(6, 7)
+    assert stream.spans[1:] == TOKENS[1:]
+    assert list(stream.spans) == TOKENS
+
+
+def test_remaining() -> None:
+    assert Stream(None, TOKENS).advance(2).remaining() == TOKENS[2:]
+
+
+def test_span_of() -> None:
+    stream = Stream(None, TOKENS)
+    assert stream.span_of(2) == Span(0, 5)
+    assert stream.span_of(10) == Span(0, 7)
+    assert stream.advance(1).span_of(0) == Span(4, 4)
+    assert stream.advance(3).span_of(1) == Span(7, 7)
+    assert Stream.from_source("").span_of(1) == Span(0, 0)
+
+
+def test_startswith() -> None:
+    stream = Stream.from_source("abcd").advance(1)
+    assert stream.startswith("bc")
+    assert not stream.startswith("ab")
+    assert not stream.startswith("bcde")
+    assert not stream.startswith("")
+
+
+def test_plain_stream_is_not_moved_by_parsing() -> None:
+    stream = Stream.from_source("aa")
+    match Just("a").parse(stream):
+        case PR.Match(_, pos):
+            assert pos.position == 1
+            assert stream.position == 0
+        case other:
+            raise AssertionError(other)
+
+
+def test_cursor_moves_in_place() -> None:
+    cursor = Cursor.at(Stream.from_source("abc"))
+    mark = cursor.mark()
+    assert cursor.advance(2) is cursor
+    assert cursor.position == 2
+    cursor.rewind(mark)
+    assert cursor.position == 0
+    assert cursor.advance(10).position == 3
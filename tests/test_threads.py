@@ -0,0 +1,137 @@
+import random
+import sys
+import typing as t
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from budget import Budget
+from combinators import (
+    Just,
+    OneOf,
+    Parser,
+    PR,
+    Recursive,
+    choice,
+    one_of,
+    skip_while,
+    startswith,
+    take_while,
+)
+from generalized import generalized
+from pratt import Infix, Prefix, precedence
+from stream import Stream
+
+# One grammar, built once and shared by every thread below.
+WS = skip_while(" ")
+NUMBER = take_while("0123456789").at_least(1).map(lambda run: int(run.item))
+VALUE = Recursive[str, t.Any, t.Any]()
+LIST = VALUE.separated_by(Just(",").then(WS)).allow_trailing().delimited_by(
+    Just("["), Just("]")
+)
+ARITH = precedence(
+    NUMBER,
+    [
+        Infix(Just("+"), 1, lambda a, _, b: a + b),
+        Infix(Just("*"), 2, lambda a, _, b: a * b),
+        Prefix(Just("-"), 3, lambda _, a: -a),
+    ],
+)
+VALUE.define(
+    choice([LIST, startswith("null").to(None), ARITH.spanned().map(lambda s: s.item)])
+)
+DOCUMENT = VALUE.then_ignore(WS)
+
+MODES: dict[str, Parser[str, t.Any, t.Any]] = {
+    "plain": DOCUMENT,
+    "deferred": DOCUMENT.deferred(),
+    "cursored": DOCUMENT.cursored(),
+    "budgeted": DOCUMENT.budgeted(Budget(max_steps=1_000_000, timeout=60.0)),
+    "all": DOCUMENT.deferred().cursored().budgeted(Budget(max_steps=1_000_000)),
+}
+
+
+def _document(rng: random.Random, depth: int = 0) -> str:
+    match rng.randrange(4) if depth < 4 else 3:
+        case 0 | 1:
+            items = [_document(rng, depth + 1) for _ in range(rng.randrange(4))]
+            return "[" + ", ".join(items) + "]"
+        case 2:
+            return "null"
+        case _:
+            terms = [str(rng.randrange(100)) for _ in range(rng.randrange(1, 4))]
+            return "".join(
+                ("-" if rng.random() < 0.2 else "") + term + rng.choice("+*")
+                for term in terms
+            )[:-1]
+
+
+def _outcome(parser: Parser[str, t.Any, t.Any], source: str) -> t.Any:
+    match parser.parse(Stream.from_source(source)):
+        case PR.Match(item, pos):
+            return item, pos.position
+        case other:
+            return other
+
+
+@pytest.fixture
+def fast_switching() -> t.Generator[None, None, None]:
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+@pytest.mark.usefixtures("fast_switching")
+def test_shared_grammar_across_threads() -> None:
+    rng = random.Random(1234)
+    sources = [_document(rng) for _ in range(60)]
+    sources += [source[: len(source) // 2] for source in sources[:20]]
+    expected = {source: _outcome(DOCUMENT, source) for source in sources}
+
+    tasks = [(mode, source) for mode in MODES for source in sources] * 4
+    random.Random(5).shuffle(tasks)
+
+    def run(task: tuple[str, str]) -> tuple[str, str, t.Any]:
+        mode, source = task
+        return mode, source, _outcome(MODES[mode], source)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        for mode, source, outcome in pool.map(run, tasks):
+            assert outcome == expected[source], (mode, source)
+
+
+@pytest.mark.usefixtures("fast_switching")
+def test_generalized_engine_is_shared_safely() -> None:
+    engine = generalized(NUMBER.separated_by(Just(",")))
+    sources = [",".join(str(n) for n in range(size)) for size in range(1, 40)]
+    expected = [_outcome(engine, source) for source in sources]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        for _ in range(3):
+            assert list(pool.map(lambda s: _outcome(engine, s), sources)) == expected
+
+
+def test_caller_collections_are_copied() -> None:
+    letters = ["a", "b"]
+    branches = [Just("x")]
+    members = {"a"}
+    one = OneOf(letters)
+    either = choice(branches)
+    run = take_while(members)
+    digits = one_of([str(n) for n in range(10)])
+
+    letters.append("c")
+    branches.append(Just("y"))
+    members.add("b")
+
+    assert one.parse(Stream.from_source("c")) is PR.NoMatch
+    assert either.parse(Stream.from_source("y")) is PR.NoMatch
+    assert run.parse(Stream.from_source("ab")).item.item == "a"
+    assert isinstance(digits.choices, tuple)
+
+
+def test_choice_accepts_a_generator() -> None:
+    either = choice(Just(c) for c in "xy")
+    for _ in range(2):
+        assert either.parse(Stream.from_source("y")).item == "y"